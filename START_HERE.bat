@@ -40,7 +40,13 @@ echo ========================================================================
 echo.
 echo Step 1: Installing dependencies...
 cd fake-news-detector
-pip install -r requirements.txt
+REM .deps_installed is a copy of the requirements.txt last installed successfully
+fc /b requirements.txt .deps_installed >nul 2>&1
+if errorlevel 1 (
+    python -m pip install --disable-pip-version-check -r requirements.txt && copy /y requirements.txt .deps_installed >nul
+) else (
+    echo ✅ requirements.txt unchanged since last install, skipping pip
+)
 echo.
 echo Step 2: Checking environment configuration...
 if not exist .env (
@@ -74,7 +80,7 @@ echo ========================================================================
 echo.
 cd fake-news-detector
 echo Installing Python packages...
-pip install -r requirements.txt
+python -m pip install --disable-pip-version-check -r requirements.txt && copy /y requirements.txt .deps_installed >nul
 echo.
 echo ✅ Dependencies installed successfully!
 echo.
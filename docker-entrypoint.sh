@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+# Bring an existing (volume-mounted) database up to date before serving:
+# adds columns introduced since it was created. The app refuses to start otherwise.
+PRELOAD_MODELS=false python fake-news-detector/init_db.py
+
+exec "$@"
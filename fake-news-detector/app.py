@@ -10,12 +10,26 @@ from config import Config
 from services.rate_limiter import rate_limiter
 from services.api_keys import api_key_manager
 from services.security import security_validator
+from services.json_provider import OrjsonProvider
 from models.user import db, User
 import os
+import threading
+import time
 
 # Initialize Flask-Login
 login_manager = LoginManager()
 
+def _missing_columns():
+    """Model columns (as table.column) an existing table lacks; init_db.py adds them"""
+    from sqlalchemy import inspect
+    inspector = inspect(db.engine)
+    missing = []
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        missing.extend(f"{table.name}.{column.name}" for column in table.columns
+                       if column.name not in existing)
+    return missing
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID for Flask-Login"""
@@ -31,12 +45,51 @@ def unauthorized():
         'message': 'Please log in to access this resource'
     }), 401
 
-def create_app():
-    """Create and configure Flask application"""
+def _preload_embedding_model(model_name):
+    """Load the embedding model, reporting failure instead of raising"""
+    try:
+        from services.similarity import preload_model
+        preload_model(model_name)
+        print(f"[OK] Embedding model preloaded: {model_name}")
+    except Exception as e:
+        print(f"[WARNING] Embedding model preload failed: {e}")
+
+def create_app(check_schema=True):
+    """
+    Create and configure Flask application
+    check_schema: refuse to start on a database missing model columns
+    (init_db.py passes False so it can add them)
+    """
     from config import Config as AppConfig
     
+    # Per-phase startup durations (ms), printed once the app is ready
+    startup_timings = {}
+    phase_start = time.perf_counter()
+    
+    # Optionally load the embedding model up front (default is lazy, on first analysis).
+    # It is independent of database setup, so load it in the background meanwhile.
+    preload_thread = None
+    if AppConfig.PRELOAD_MODELS:
+        preload_thread = threading.Thread(
+            target=_preload_embedding_model,
+            args=(AppConfig.EMBEDDING_MODEL,),
+            daemon=True
+        )
+        preload_thread.start()
+    
     app = Flask(__name__)
     app.config.from_object(AppConfig)
+    app.json = OrjsonProvider(app)
+    
+    # Behind a reverse proxy, take remote_addr from the hops it appends to
+    # X-Forwarded-For; without one the header is client-controlled and ignored
+    if AppConfig.TRUSTED_PROXY_COUNT > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app,
+            x_for=AppConfig.TRUSTED_PROXY_COUNT,
+            x_proto=AppConfig.TRUSTED_PROXY_COUNT
+        )
     
     # Authentication configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', os.urandom(24).hex())
@@ -73,6 +126,7 @@ def create_app():
     login_manager.login_view = None
     
     # Create database tables (with error handling)
+    missing_columns = []
     with app.app_context():
         try:
             # Import models to ensure they're registered
@@ -81,10 +135,45 @@ def create_app():
             from models.database import AnalysisCache
             from models.rag_analysis_log import RAGAnalysisLog, RAGMetrics
             db.create_all()
+            
+            # create_all() skips existing tables, so add any indexes introduced
+            # since (new columns are added by init_db.py, not on every startup).
+            # IF NOT EXISTS rather than checkfirst: SQLite reflection skips
+            # expression indexes such as ix_users_email_lower.
+            from sqlalchemy.schema import CreateIndex
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    try:
+                        with db.engine.begin() as conn:
+                            # Called as a DDL listener so dialect-only indexes (ddl_if) are honoured
+                            CreateIndex(index, if_not_exists=True)(index, conn)
+                    except Exception as e:
+                        # e.g. a unique index over legacy duplicate rows; init_db.py reports them
+                        print(f"[WARNING] Could not create index {index.name}: {e}")
+            missing_columns = _missing_columns()
             print("[OK] Database tables created/verified")
         except Exception as e:
             print(f"[WARNING] Database initialization warning: {e}")
             print("  Database will be created on first use")
+        
+        # Drop pooled connections so preloaded (forked) workers open their own
+        db.engine.dispose()
+    
+    # Every history read and write selects the new columns, so serving would fail
+    if check_schema and missing_columns:
+        raise RuntimeError(
+            f"Database schema is out of date (missing {', '.join(missing_columns)}); "
+            f"run 'python init_db.py' to add the columns"
+        )
+    
+    startup_timings['database'] = (time.perf_counter() - phase_start) * 1000
+    phase_start = time.perf_counter()
+    
+    # Wait for the preload to finish so it completes before workers fork
+    if preload_thread is not None:
+        preload_thread.join()
+        startup_timings['model_preload_wait'] = (time.perf_counter() - phase_start) * 1000
+        phase_start = time.perf_counter()
     
     # Configure CORS with credentials support
     CORS(app, 
@@ -180,9 +269,7 @@ def create_app():
             return None
         
         # Get client IP
-        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-        if client_ip and ',' in client_ip:
-            client_ip = client_ip.split(',')[0].strip()
+        client_ip = security_validator.get_client_ip(request)
         
         # Rate limiting
         allowed, rate_info = rate_limiter.is_allowed(client_ip)
@@ -194,9 +281,7 @@ def create_app():
             })
             
             # Add security headers
-            headers = security_validator.get_security_headers()
-            for header, value in headers.items():
-                response.headers[header] = value
+            security_validator.apply_security_headers(response)
             
             response.status_code = 429
             return response
@@ -215,9 +300,7 @@ def create_app():
                 })
                 
                 # Add security headers
-                headers = security_validator.get_security_headers()
-                for header, value in headers.items():
-                    response.headers[header] = value
+                security_validator.apply_security_headers(response)
                 
                 response.status_code = 401
                 return response
@@ -227,9 +310,7 @@ def create_app():
         """Add security and rate limit headers to all responses"""
         
         # Get client IP for rate limit headers
-        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-        if client_ip and ',' in client_ip:
-            client_ip = client_ip.split(',')[0].strip()
+        client_ip = security_validator.get_client_ip(request)
         
         # Add rate limit headers
         rate_headers = rate_limiter.get_rate_limit_headers(client_ip)
@@ -237,10 +318,7 @@ def create_app():
             response.headers[header] = value
         
         # Add security headers (if not already added)
-        security_headers = security_validator.get_security_headers()
-        for header, value in security_headers.items():
-            if header not in response.headers:
-                response.headers[header] = value
+        security_validator.apply_security_headers(response, overwrite=False)
         
         return response
     
@@ -253,9 +331,14 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(history_bp)
     app.register_blueprint(rag_analyze_bp)
+    startup_timings['routes'] = (time.perf_counter() - phase_start) * 1000
+    
+    print("[OK] Startup timings: " + ", ".join(
+        f"{phase}={ms:.0f}ms" for phase, ms in startup_timings.items()
+    ))
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=Config.DEBUG)
\ No newline at end of file
@@ -35,10 +35,23 @@ class Config:
     
     # Model configuration
     EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL') or 'all-MiniLM-L6-v2'
+    # Load the embedding model in create_app() instead of on first request,
+    # so forked server workers share its memory pages copy-on-write
+    PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', 'False').lower() == 'true'
+    # Run the embedding model's linear layers with int8 weights (dynamic quantization).
+    # Faster on CPU but vectors shift slightly, so check retrieval quality first.
+    EMBEDDING_INT8 = os.environ.get('EMBEDDING_INT8', 'False').lower() == 'true'
     
     # API limits
     NEWS_API_LIMIT = int(os.environ.get('NEWS_API_LIMIT', '15'))
     REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', '10'))
+    # Run a COUNT query for history pages that have a next page, so `total`/`pages`
+    # are always filled in. When off, those pages report has_more with a null total.
+    PAGINATION_COUNT = os.environ.get('PAGINATION_COUNT', 'True').lower() == 'true'
+    
+    # Number of reverse proxies in front of the app whose X-Forwarded-For entries
+    # are trusted for the client IP (rate limits, login throttling). 0 = direct.
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', '0'))
     
     @staticmethod
     def validate_config():
@@ -7,39 +7,104 @@ import sys
 # Add parent directory to path to import app modules
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app import create_app, db
-from models.user import User
-from models.user_analysis import UserAnalysis
 
-print("=" * 60)
-print("Initializing Database")
-print("=" * 60)
+def add_missing_columns(db):
+    """ALTER TABLE ... ADD COLUMN for nullable model columns an existing table lacks"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(db.engine)
+    quote = db.engine.dialect.identifier_preparer.quote
+    added = []
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                ))
+            added.append(f"{table.name}.{column.name}")
+    return added
 
-# Create Flask app
-app = create_app()
 
-with app.app_context():
-    # Create all tables from models (will not recreate existing tables)
-    print("\nCreating tables from models...")
-    db.create_all()
-    print("✓ Created all tables")
-    
-    # Verify tables were created
+def normalize_user_emails(db):
+    """
+    Lowercase stored emails (accounts created before emails were normalized)
+    Returns: (rows updated, lowercased emails shared by several accounts)
+    """
+    from models.user import User
+    lowered = db.func.lower(User.email)
+    # Accounts that differ only by case are left as they are for a manual merge
+    duplicates = [email for (email,) in db.session.query(lowered)
+                  .group_by(lowered).having(db.func.count(User.id) > 1)]
+    updated = User.query.filter(
+        User.email != lowered, lowered.notin_(duplicates)
+    ).update({User.email: lowered}, synchronize_session=False)
+    db.session.commit()
+    return updated, duplicates
+
+
+def rebuild_email_index(db):
+    """Recreate ix_users_email_lower, replacing an older non-unique copy with the unique one"""
+    from sqlalchemy.schema import CreateIndex, DropIndex
+    from models.user import User
+    # Expression indexes aren't reflected on every backend, so rebuild rather than
+    # inspect; it is one index over the users table
+    index = next(i for i in User.__table__.indexes if i.name == 'ix_users_email_lower')
+    with db.engine.begin() as conn:
+        DropIndex(index, if_exists=True)(index, conn)
+        CreateIndex(index)(index, conn)
+
+
+def main():
+    """Create all tables and print a summary of the resulting schema"""
+    from app import create_app, db
     from sqlalchemy import inspect
-    inspector = inspect(db.engine)
-    tables = inspector.get_table_names()
-    
-    print("\n" + "=" * 60)
-    print("✅ Database initialized successfully!")
+
     print("=" * 60)
-    print(f"\nDatabase location: {app.config['SQLALCHEMY_DATABASE_URI']}")
-    print(f"\nTables created ({len(tables)}):")
-    for table in tables:
-        columns = inspector.get_columns(table)
-        print(f"  ✓ {table} ({len(columns)} columns)")
-        for col in columns:
-            print(f"      - {col['name']}: {col['type']}")
-    
-    print("\nYou can now start the server:")
-    print("  python serve_frontend.py")
+    print("Initializing Database")
     print("=" * 60)
+
+    # Create Flask app (create_app() creates all tables and indexes from models)
+    print("\nCreating tables from models...")
+    app = create_app(check_schema=False)
+    print("✓ Created all tables")
+
+    with app.app_context():
+        # create_all() skips existing tables; add nullable columns introduced
+        # since (e.g. user_analyses.input_preview) so older databases keep up
+        for name in add_missing_columns(db):
+            print(f"✓ Added column {name}")
+
+        updated, duplicates = normalize_user_emails(db)
+        if updated:
+            print(f"✓ Lowercased {updated} user emails")
+        if duplicates:
+            print(f"⚠️  Accounts differing only by email case (merge them by hand): {', '.join(duplicates)}")
+        else:
+            rebuild_email_index(db)
+            print("✓ Rebuilt unique index ix_users_email_lower")
+
+        # Verify tables were created
+        inspector = inspect(db.engine)
+        tables = inspector.get_table_names()
+
+        print("\n" + "=" * 60)
+        print("✅ Database initialized successfully!")
+        print("=" * 60)
+        print(f"\nDatabase location: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        print(f"\nTables created ({len(tables)}):")
+        for table in tables:
+            columns = inspector.get_columns(table)
+            print(f"  ✓ {table} ({len(columns)} columns)")
+            for col in columns:
+                print(f"      - {col['name']}: {col['type']}")
+
+        print("\nYou can now start the server:")
+        print("  python serve_frontend.py")
+        print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
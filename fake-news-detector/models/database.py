@@ -2,14 +2,15 @@
 Database models and operations using SQLAlchemy
 """
 
-import os
 import json
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 from models.user import db
 
+# Prefix of AnalysisCache.url keys that hold text submissions (content hashes, not URLs)
+TEXT_KEY_PREFIX = 'text:'
+
 class AnalysisCache(db.Model):
     """Anonymous analysis results table"""
     __tablename__ = 'analysis'
@@ -25,6 +26,16 @@ class AnalysisCache(db.Model):
     processing_time = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+def _dialect_insert(dialect_name: str):
+    """Dialect-specific insert() supporting on_conflict_do_update, or None"""
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
 class Database:
     """Database service for persistent storage"""
     
@@ -42,24 +53,35 @@ class Database:
             matched_articles_json = json.dumps(matched_articles or [])
             key_claims_json = json.dumps(key_claims or [])
             
-            # Check if exists
+            values = {
+                'summary': summary,
+                'verdict': verdict,
+                'confidence': confidence,
+                'explanation': explanation,
+                'matched_articles': matched_articles_json,
+                'key_claims': key_claims_json,
+                'processing_time': processing_time,
+                'created_at': datetime.utcnow(),
+            }
+            
+            # Single INSERT ... ON CONFLICT (url) DO UPDATE round trip on SQLite/PostgreSQL
+            insert = _dialect_insert(db.engine.dialect.name)
+            if insert is not None:
+                stmt = insert(AnalysisCache).values(url=url, **values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[AnalysisCache.url], set_=values
+                ).returning(AnalysisCache.id)
+                record_id = db.session.execute(stmt).scalar()
+                db.session.commit()
+                return record_id
+            
+            # Other backends: check if exists, then update or insert
             record = AnalysisCache.query.filter_by(url=url).first()
             if record:
-                record.summary = summary
-                record.verdict = verdict
-                record.confidence = confidence
-                record.explanation = explanation
-                record.matched_articles = matched_articles_json
-                record.key_claims = key_claims_json
-                record.processing_time = processing_time
-                record.created_at = datetime.utcnow()
+                for column, value in values.items():
+                    setattr(record, column, value)
             else:
-                record = AnalysisCache(
-                    url=url, summary=summary, verdict=verdict,
-                    confidence=confidence, explanation=explanation,
-                    matched_articles=matched_articles_json,
-                    key_claims=key_claims_json, processing_time=processing_time
-                )
+                record = AnalysisCache(url=url, **values)
                 db.session.add(record)
                 
             db.session.commit()
@@ -95,7 +117,14 @@ class Database:
     def get_recent_analyses(self, limit: int = 10) -> List[Dict]:
         """Get recent analysis results"""
         try:
-            records = AnalysisCache.query.order_by(desc(AnalysisCache.created_at)).limit(limit).all()
+            # Select only the listed columns; summary/explanation/JSON blobs stay in the DB
+            records = db.session.query(
+                AnalysisCache.id, AnalysisCache.url, AnalysisCache.verdict,
+                AnalysisCache.confidence, AnalysisCache.created_at
+            ).filter(
+                # Text submissions are keyed by content hash and have no URL to list
+                ~AnalysisCache.url.startswith(TEXT_KEY_PREFIX)
+            ).order_by(desc(AnalysisCache.created_at)).limit(limit).all()
             return [
                 {
                     'id': r.id, 'url': r.url, 'verdict': r.verdict,
@@ -110,14 +139,20 @@ class Database:
     def get_analysis_stats(self) -> Dict:
         """Get analysis statistics"""
         try:
-            total = db.session.query(func.count(AnalysisCache.id)).scalar() or 0
-            
-            verdict_counts = db.session.query(
-                AnalysisCache.verdict, func.count(AnalysisCache.id)
+            # Per-verdict counts and confidence sums in a single grouped query
+            rows = db.session.query(
+                AnalysisCache.verdict,
+                func.count(AnalysisCache.id),
+                func.sum(AnalysisCache.confidence)
             ).group_by(AnalysisCache.verdict).all()
-            verdict_stats = {v: c for v, c in verdict_counts}
+            verdict_stats = {v: c for v, c, _ in rows}
+            
+            # Every row falls in exactly one verdict group, so the table total
+            # comes from the grouped counts rather than a separate COUNT(*) scan
+            total = sum(verdict_stats.values())
             
-            avg_confidence = db.session.query(func.avg(AnalysisCache.confidence)).scalar() or 0.0
+            confidence_sum = sum(conf_sum or 0 for _, _, conf_sum in rows)
+            avg_confidence = confidence_sum / total if total else 0.0
             
             return {
                 'total_analyses': total,
@@ -10,6 +10,17 @@ from models.user import db
 class KnowledgeArticle(db.Model):
     """Knowledge base article for RAG similarity search"""
     __tablename__ = 'knowledge_articles'
+    __table_args__ = (
+        # Serves search_knowledge_base: ORDER BY embedding <=> :target LIMIT k walks
+        # the HNSW graph instead of computing the distance to every stored vector.
+        # pgvector (>= 0.5) is Postgres-only, so the index is skipped on SQLite.
+        db.Index(
+            'ix_knowledge_articles_embedding_hnsw', 'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     url = db.Column(db.String(512), unique=True, nullable=False, index=True)
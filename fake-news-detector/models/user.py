@@ -2,6 +2,7 @@
 User model for authentication system
 """
 from datetime import datetime, timedelta
+from typing import Optional
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 
@@ -23,6 +24,31 @@ class User(db.Model, UserMixin):
     failed_login_attempts = db.Column(db.Integer, default=0, nullable=False)
     locked_until = db.Column(db.DateTime, nullable=True)
     
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """Canonical stored form of an email address"""
+        return email.strip().lower()
+    
+    @db.validates('email')
+    def _normalize_email_on_write(self, key, email):
+        """Store every email in its normalized form"""
+        return self.normalize_email(email) if email else email
+    
+    @classmethod
+    def email_matches(cls, email: str):
+        """Case-insensitive email filter, served by the lower(email) index"""
+        return db.func.lower(cls.email) == cls.normalize_email(email)
+    
+    @classmethod
+    def find_by_email(cls, email: str) -> Optional['User']:
+        """
+        User for an email, case-insensitively. Legacy rows that differ only by
+        case (saved before emails were normalized) resolve to the exact spelling.
+        """
+        return cls.query.filter(cls.email_matches(email)).order_by(
+            (cls.email == email.strip()).desc(), cls.id
+        ).first()
+    
     def set_password(self, password: str) -> None:
         """Hash and set password"""
         from services.password_service import password_service
@@ -30,9 +56,10 @@ class User(db.Model, UserMixin):
     
     def check_password(self, password: str) -> bool:
         """Verify password against hash"""
-        if not self.password_hash:
-            return False
         from services.password_service import password_service
+        if not self.password_hash:
+            # OAuth-only account: keep timing identical to a real check
+            return password_service.dummy_verify(password)
         return password_service.verify_password(password, self.password_hash)
     
     def to_dict(self) -> dict:
@@ -65,3 +92,7 @@ class User(db.Model, UserMixin):
             self.unlock_account()
             return False
         return True
+
+# Expression index for User.email_matches(): lower(email) = ? stays an index seek,
+# and no two accounts can differ only by email case
+db.Index('ix_users_email_lower', db.func.lower(User.email), unique=True)
@@ -7,6 +7,10 @@ from models.user import db
 class UserAnalysis(db.Model):
     """User analysis history model"""
     __tablename__ = 'user_analyses'
+    __table_args__ = (
+        # Serves the history listing: WHERE user_id = ? ORDER BY created_at DESC
+        db.Index('ix_user_analyses_user_id_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -14,6 +18,14 @@ class UserAnalysis(db.Model):
     # Analysis details
     input_type = db.Column(db.String(20), nullable=False)  # 'url' or 'text'
     input_content = db.Column(db.Text, nullable=False)  # URL or text snippet
+    # Listing preview, stored at insert so listings never read the submitted text
+    input_preview = db.Column(db.String(103), nullable=True)
+    # Leading characters of input_content, only for rows saved before
+    # input_preview existed (NULL otherwise; CASE skips the substr)
+    input_head = db.column_property(db.case(
+        (input_preview.is_(None), db.func.substr(input_content, 1, 101)),
+        else_=None
+    ))
     
     # Results
     verdict = db.Column(db.String(20), nullable=False)  # 'REAL', 'FAKE', 'UNCERTAIN'
@@ -28,16 +40,35 @@ class UserAnalysis(db.Model):
     # Relationship
     user = db.relationship('User', backref=db.backref('analyses', lazy='dynamic'))
     
-    def to_dict(self) -> dict:
-        """Convert analysis to dictionary"""
+    @classmethod
+    def summary_columns(cls) -> tuple:
+        """Columns read by summary_dict(), for listings that select plain rows"""
+        return (
+            cls.id, cls.input_type, cls.input_preview, cls.input_head, cls.verdict, cls.confidence,
+            cls.explanation, cls.matched_articles_count, cls.processing_time, cls.created_at
+        )
+    
+    @staticmethod
+    def preview_of(input_content: str) -> str:
+        """Listing preview of submitted content: its first 100 characters"""
+        return input_content[:100] + '...' if len(input_content) > 100 else input_content
+    
+    @staticmethod
+    def summary_dict(record) -> dict:
+        """Dictionary for an analysis instance or a row of summary_columns()"""
         return {
-            'id': self.id,
-            'input_type': self.input_type,
-            'input_preview': self.input_content[:100] + '...' if len(self.input_content) > 100 else self.input_content,
-            'verdict': self.verdict,
-            'confidence': round(self.confidence * 100, 1),  # Convert to percentage
-            'explanation': self.explanation,
-            'matched_articles_count': self.matched_articles_count,
-            'processing_time': round(self.processing_time, 2) if self.processing_time else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'id': record.id,
+            'input_type': record.input_type,
+            'input_preview': (record.input_preview if record.input_preview is not None
+                              else UserAnalysis.preview_of(record.input_head)),
+            'verdict': record.verdict,
+            'confidence': round(record.confidence * 100, 1),  # Convert to percentage
+            'explanation': record.explanation,
+            'matched_articles_count': record.matched_articles_count,
+            'processing_time': round(record.processing_time, 2) if record.processing_time else None,
+            'created_at': record.created_at.isoformat() if record.created_at else None
         }
+    
+    def to_dict(self) -> dict:
+        """Convert analysis to dictionary"""
+        return self.summary_dict(self)
@@ -5,12 +5,13 @@ Analysis route for fake news detection
 import time
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from urllib.parse import urlparse
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from config import Config
-from functools import wraps
-
-from functools import wraps
+from functools import wraps, lru_cache
+import importlib.util
+from types import MappingProxyType
 
 # Import all required services
 from models.database import Database
@@ -28,7 +29,7 @@ from services.security import security_validator
 from services.error_handler import error_handler, ErrorType
 
 # Import history saving function
-from routes.history import save_user_analysis
+from routes.history import queue_user_analysis
 from flask_login import current_user
 
 analyze_bp = Blueprint('analyze', __name__)
@@ -36,6 +37,18 @@ analyze_bp = Blueprint('analyze', __name__)
 # Initialize services (will be done once when blueprint is registered)
 _services = {}
 
+# Last /health response body (already serialized JSON), reused for HEALTH_CACHE_TTL
+# seconds so frequent probes don't re-run the checks or re-encode the payload.
+# Held as one (expires_at, body) tuple and swapped whole, so concurrent requests
+# never see an expiry from one check paired with the body of another.
+HEALTH_CACHE_TTL = 10
+_health_cache = None
+
+# Runs the /health Groq probe alongside the local checks. One shared worker: a hung
+# probe holds at most this thread, and later probes time out waiting behind it.
+HEALTH_LLM_TIMEOUT = 5  # seconds
+_health_probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-probe')
+
 class TimeoutError(Exception):
     """Custom timeout exception"""
     pass
@@ -140,10 +153,7 @@ def with_timeout_and_retry(timeout_seconds=10, max_retries=2):
 
 def add_security_headers(response):
     """Add security headers to response"""
-    headers = security_validator.get_security_headers()
-    for header, value in headers.items():
-        response.headers[header] = value
-    return response
+    return security_validator.apply_security_headers(response)
 
 def secure_error_response(error_message: str, status_code: int, processing_time: float = None):
     """Create error response with security headers"""
@@ -248,7 +258,7 @@ def save_to_user_history(input_type: str, input_content: str, verdict: str,
     """Save analysis to user's history if user is logged in"""
     try:
         if current_user.is_authenticated:
-            save_user_analysis(
+            queue_user_analysis(
                 user_id=current_user.id,
                 input_type=input_type,
                 input_content=input_content,
@@ -430,9 +440,15 @@ def analyze_url():
         
         # Step 2.5: Detect language and process multilingual content
         language_start = time.time()
+        # Content lowercased once for both language and pattern detection
+        content_lower = None
         try:
+            content_lower = article.content.lower()
+            
             # Detect language of the article content
-            language_result = services['language_detector'].detect_language(article.content)
+            language_result = services['language_detector'].detect_language(
+                article.content, text_lower=content_lower
+            )
             
             # Process content based on detected language
             processed_content, confidence_adjustment = services['language_detector'].process_multilingual_content(
@@ -440,6 +456,8 @@ def analyze_url():
             )
             
             # Update article content with processed version
+            if processed_content is not article.content:
+                content_lower = None  # language tag prepended
             article.content = processed_content
             
             language_duration = time.time() - language_start
@@ -471,7 +489,7 @@ def analyze_url():
         try:
             # Detect patterns in article content and title
             pattern_result = services['pattern_detector'].detect_patterns(
-                article.content, article.title
+                article.content, article.title, content_lower=content_lower
             )
             
             pattern_duration = time.time() - pattern_start
@@ -770,6 +788,11 @@ def analyze_url():
             processing_time
         )
 
+# Host part of a URL: letters, numbers, hyphens, and dots
+DOMAIN_NAME_PATTERN = re.compile(
+    r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
+)
+
 def _is_valid_url(url: str) -> bool:
     """Validate URL format and protocol"""
     if not url or not isinstance(url, str):
@@ -788,11 +811,7 @@ def _is_valid_url(url: str) -> bool:
             return False
         
         # Basic domain validation
-        domain_pattern = re.compile(
-            r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
-        )
-        
-        if not domain_pattern.match(parsed.netloc.split(':')[0]):
+        if not DOMAIN_NAME_PATTERN.match(parsed.netloc.split(':')[0]):
             return False
         
         return True
@@ -800,6 +819,50 @@ def _is_valid_url(url: str) -> bool:
     except Exception:
         return False
 
+# Trusted sources to detect in raw text, mapped to the phrases that identify them
+TRUSTED_SOURCE_PATTERNS = MappingProxyType({
+    # International sources
+    'BBC': ('bbc', 'british broadcasting corporation'),
+    'Reuters': ('reuters',),
+    'Associated Press': ('associated press', 'ap news', 'the associated press'),
+    'CNN': ('cnn', 'cable news network'),
+    'The Guardian': ('the guardian', 'guardian'),
+    'New York Times': ('new york times', 'nytimes', 'the new york times'),
+    'Washington Post': ('washington post', 'washingtonpost'),
+    'Wall Street Journal': ('wall street journal', 'wsj'),
+    'NPR': ('npr', 'national public radio'),
+    'PBS': ('pbs', 'public broadcasting service'),
+    'Bloomberg': ('bloomberg',),
+    'Financial Times': ('financial times', 'ft.com'),
+    'Al Jazeera': ('al jazeera', 'aljazeera'),
+    'France 24': ('france 24', 'france24'),
+    'DW': ('deutsche welle', 'dw.com'),
+    
+    # Indian sources
+    'The Hindu': ('the hindu', 'thehindu'),
+    'Indian Express': ('indian express', 'indianexpress'),
+    'Times of India': ('times of india', 'timesofindia'),
+    'Hindustan Times': ('hindustan times', 'hindustantimes'),
+    'NDTV': ('ndtv',),
+    'India Today': ('india today', 'indiatoday'),
+    'News18': ('news18',),
+    'Firstpost': ('firstpost',),
+    'The Quint': ('the quint', 'thequint'),
+    'Scroll': ('scroll.in', 'scroll'),
+    'The Print': ('the print', 'theprint'),
+    'Mint': ('mint', 'livemint'),
+    'Moneycontrol': ('moneycontrol',),
+    'Economic Times': ('economic times', 'economictimes'),
+    'Deccan Herald': ('deccan herald',),
+    'Telegraph India': ('telegraph india', 'telegraphindia'),
+    'Tribune India': ('tribune india', 'tribuneindia'),
+    
+    # News agencies
+    'PTI': ('pti', 'press trust of india'),
+    'ANI': ('ani', 'asian news international'),
+    'IANS': ('ians', 'indo-asian news service')
+})
+
 def _detect_source_from_text(text: str) -> str:
     """
     Detect news source from text content by looking for source mentions
@@ -808,50 +871,6 @@ def _detect_source_from_text(text: str) -> str:
     if not text:
         return ""
     
-    # Comprehensive list of trusted sources to detect
-    trusted_sources_patterns = {
-        # International sources
-        'BBC': ['bbc', 'british broadcasting corporation'],
-        'Reuters': ['reuters'],
-        'Associated Press': ['associated press', 'ap news', 'the associated press'],
-        'CNN': ['cnn', 'cable news network'],
-        'The Guardian': ['the guardian', 'guardian'],
-        'New York Times': ['new york times', 'nytimes', 'the new york times'],
-        'Washington Post': ['washington post', 'washingtonpost'],
-        'Wall Street Journal': ['wall street journal', 'wsj'],
-        'NPR': ['npr', 'national public radio'],
-        'PBS': ['pbs', 'public broadcasting service'],
-        'Bloomberg': ['bloomberg'],
-        'Financial Times': ['financial times', 'ft.com'],
-        'Al Jazeera': ['al jazeera', 'aljazeera'],
-        'France 24': ['france 24', 'france24'],
-        'DW': ['deutsche welle', 'dw.com'],
-        
-        # Indian sources
-        'The Hindu': ['the hindu', 'thehindu'],
-        'Indian Express': ['indian express', 'indianexpress'],
-        'Times of India': ['times of india', 'timesofindia'],
-        'Hindustan Times': ['hindustan times', 'hindustantimes'],
-        'NDTV': ['ndtv'],
-        'India Today': ['india today', 'indiatoday'],
-        'News18': ['news18'],
-        'Firstpost': ['firstpost'],
-        'The Quint': ['the quint', 'thequint'],
-        'Scroll': ['scroll.in', 'scroll'],
-        'The Print': ['the print', 'theprint'],
-        'Mint': ['mint', 'livemint'],
-        'Moneycontrol': ['moneycontrol'],
-        'Economic Times': ['economic times', 'economictimes'],
-        'Deccan Herald': ['deccan herald'],
-        'Telegraph India': ['telegraph india', 'telegraphindia'],
-        'Tribune India': ['tribune india', 'tribuneindia'],
-        
-        # News agencies
-        'PTI': ['pti', 'press trust of india'],
-        'ANI': ['ani', 'asian news international'],
-        'IANS': ['ians', 'indo-asian news service']
-    }
-    
     text_lower = text.lower()
     
     # Check first 500 characters for source mentions (usually at top or bottom)
@@ -860,7 +879,7 @@ def _detect_source_from_text(text: str) -> str:
     search_text = text_start + " " + text_end
     
     # Look for source patterns
-    for source_name, patterns in trusted_sources_patterns.items():
+    for source_name, patterns in TRUSTED_SOURCE_PATTERNS.items():
         for pattern in patterns:
             # Check for exact mentions
             if pattern in search_text:
@@ -936,13 +955,60 @@ def analyze_text():
                 processing_time=time.time() - start_time
             )
         
+        # Keep the submitted text for the content-hash cache key
+        original_text = text_content
+        
+        # Check cache for an identical earlier submission
+        try:
+            cached_result = services['cache'].get_cached_text_result(original_text)
+            
+            if cached_result:
+                performance_logger.log_cache_hit(request_id, 'text_analysis')
+                processing_time = time.time() - start_time
+                
+                performance_logger.complete_analysis(
+                    request_id, cached_result['verdict'],
+                    cached_result['confidence'], processing_time
+                )
+                
+                # Repeat submissions still belong in the user's history
+                save_to_user_history(
+                    input_type='text',
+                    input_content=original_text[:500],  # Save first 500 chars of the submission as preview
+                    verdict=cached_result['verdict'],
+                    confidence=cached_result['confidence'],
+                    explanation=cached_result['explanation'],
+                    matched_articles=cached_result['matched_articles'],
+                    processing_time=processing_time
+                )
+                
+                response = jsonify({
+                    'verdict': cached_result['verdict'],
+                    'confidence': f"{cached_result['confidence']:.0%}",
+                    'explanation': cached_result['explanation'] + " (from cache)",
+                    'matched_articles': cached_result['matched_articles'][:3],
+                    'processing_time': round(processing_time, 2)
+                })
+                
+                return add_security_headers(response)
+            else:
+                performance_logger.log_cache_miss(request_id, 'text_analysis')
+                
+        except Exception as e:
+            print(f"Cache check failed: {str(e)}, continuing without cache")
+        
         # Step 1: Detect language
         language_start = time.time()
+        # Text lowercased once for both language and pattern detection
+        text_lower = None
         try:
-            language_result = services['language_detector'].detect_language(text_content)
+            text_lower = text_content.lower()
+            language_result = services['language_detector'].detect_language(text_content, text_lower=text_lower)
             processed_content, confidence_adjustment = services['language_detector'].process_multilingual_content(
                 text_content, language_result.language
             )
+            if processed_content is not text_content:
+                text_lower = None  # language tag prepended
             text_content = processed_content
             
             language_duration = time.time() - language_start
@@ -957,7 +1023,7 @@ def analyze_text():
         # Step 2: Detect patterns
         pattern_start = time.time()
         try:
-            pattern_result = services['pattern_detector'].detect_patterns(text_content, "")
+            pattern_result = services['pattern_detector'].detect_patterns(text_content, "", content_lower=text_lower)
             pattern_duration = time.time() - pattern_start
             performance_logger.log_step(request_id, "pattern_detection", pattern_duration)
         except Exception as e:
@@ -1163,13 +1229,29 @@ def analyze_text():
         processing_time = time.time() - start_time
         result.processing_time = processing_time
         
+        # Store result in cache under the content hash
+        try:
+            services['cache'].store_text_result(
+                text=original_text,
+                summary=summary,
+                verdict=result.verdict.value,
+                confidence=result.confidence,
+                explanation=result.explanation,
+                matched_articles=result.matched_articles,
+                key_claims=key_claims,
+                processing_time=processing_time
+            )
+        except Exception as e:
+            performance_logger.log_step(request_id, "cache_storage", error=str(e))
+            print(f"Cache storage failed: {str(e)}, continuing without caching")
+        
         # Complete analysis tracking
         performance_logger.complete_analysis(request_id, result.verdict.value, result.confidence, processing_time)
         
         # Save to user history if logged in
         save_to_user_history(
             input_type='text',
-            input_content=text_content[:500],  # Save first 500 chars as preview
+            input_content=original_text[:500],  # Save first 500 chars of the submission as preview
             verdict=result.verdict.value,
             confidence=result.confidence,
             explanation=result.explanation,
@@ -1199,6 +1281,11 @@ def analyze_text():
             processing_time
         )
 
+@lru_cache(maxsize=1)
+def _ocr_libraries_installed() -> bool:
+    """Check for pytesseract and Pillow without importing them (result cached per process)"""
+    return all(importlib.util.find_spec(name) is not None for name in ('pytesseract', 'PIL'))
+
 @analyze_bp.route('/analyze-image', methods=['POST'])
 def analyze_image():
     """
@@ -1224,6 +1311,15 @@ def analyze_image():
                 ErrorType.VALIDATION_ERROR, request_id,
                 processing_time=time.time() - start_time
             )
+        
+        # Fail fast, without reading the upload, when the OCR libraries are missing
+        if not _ocr_libraries_installed():
+            return error_handler.create_error_response(
+                RuntimeError("OCR libraries (pytesseract or Pillow) are not installed."),
+                ErrorType.INTERNAL_ERROR, request_id,
+                user_message="OCR libraries (pytesseract or Pillow) are not installed.",
+                processing_time=time.time() - start_time
+            )
             
         try:
             import pytesseract
@@ -1277,11 +1373,16 @@ def analyze_image():
             
         # Step 1: Detect language
         language_start = time.time()
+        # Text lowercased once for both language and pattern detection
+        text_lower = None
         try:
-            language_result = services['language_detector'].detect_language(text_content)
+            text_lower = text_content.lower()
+            language_result = services['language_detector'].detect_language(text_content, text_lower=text_lower)
             processed_content, confidence_adjustment = services['language_detector'].process_multilingual_content(
                 text_content, language_result.language
             )
+            if processed_content is not text_content:
+                text_lower = None  # language tag prepended
             text_content = processed_content
             performance_logger.log_step(request_id, "language_detection", time.time() - language_start,
                 details={'detected_language': language_result.language})
@@ -1292,7 +1393,7 @@ def analyze_image():
         # Step 2: Detect patterns
         pattern_start = time.time()
         try:
-            pattern_result = services['pattern_detector'].detect_patterns(text_content, "")
+            pattern_result = services['pattern_detector'].detect_patterns(text_content, "", content_lower=text_lower)
             performance_logger.log_step(request_id, "pattern_detection", time.time() - pattern_start)
         except Exception as e:
             pattern_result = None
@@ -1404,7 +1505,14 @@ def analyze_image():
 @analyze_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint with comprehensive error handling"""
+    global _health_cache
     try:
+        cached = _health_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return add_security_headers(
+                Response(cached[1], mimetype='application/json')
+            )
+        
         # Test service initialization
         services = get_services()
         
@@ -1429,17 +1537,10 @@ def health_check():
         # Test individual service health
         service_errors = []
         
-        # Test LLM service availability
-        try:
-            if hasattr(services['summarizer'], 'is_service_available'):
-                if not services['summarizer'].is_service_available():
-                    health_status['services']['summarizer'] = 'unavailable'
-                    health_status['status'] = 'degraded'
-                    service_errors.append('Groq API unavailable')
-        except Exception as e:
-            health_status['services']['summarizer'] = 'error'
-            health_status['status'] = 'degraded'
-            service_errors.append(f'Groq API error: {str(e)}')
+        # Start the Groq availability probe (network bound) so the local checks below overlap it
+        llm_check = None
+        if hasattr(services['summarizer'], 'is_service_available'):
+            llm_check = _health_probe_executor.submit(services['summarizer'].is_service_available)
         
         # Test database connectivity
         try:
@@ -1452,9 +1553,14 @@ def health_check():
         
         # Test similarity engine
         try:
-            # Quick test of similarity engine
-            test_embedding = services['similarity'].generate_embedding("test")
-            if test_embedding is not None:
+            if services['similarity'].model is None:
+                # Model not loaded yet: check the library is installed rather than
+                # importing torch and loading the model just to answer a probe
+                model_available = importlib.util.find_spec('sentence_transformers') is not None
+            else:
+                # Quick test of similarity engine
+                model_available = services['similarity'].generate_embedding("test") is not None
+            if model_available:
                 health_status['services']['similarity'] = 'ok'
             else:
                 health_status['services']['similarity'] = 'error'
@@ -1495,6 +1601,21 @@ def health_check():
             health_status['status'] = 'degraded'
             service_errors.append(f'Pattern detector error: {str(e)}')
         
+        # Collect LLM service availability
+        try:
+            if llm_check is not None and not llm_check.result(timeout=HEALTH_LLM_TIMEOUT):
+                health_status['services']['summarizer'] = 'unavailable'
+                health_status['status'] = 'degraded'
+                service_errors.append('Groq API unavailable')
+        except FutureTimeoutError:
+            health_status['services']['summarizer'] = 'unavailable'
+            health_status['status'] = 'degraded'
+            service_errors.append('Groq API check timed out')
+        except Exception as e:
+            health_status['services']['summarizer'] = 'error'
+            health_status['status'] = 'degraded'
+            service_errors.append(f'Groq API error: {str(e)}')
+        
         # Add error details if any
         if service_errors:
             health_status['errors'] = service_errors
@@ -1507,7 +1628,10 @@ def health_check():
             'performance_logger': 'active'
         }
         
-        return add_security_headers(jsonify(health_status))
+        response = jsonify(health_status)
+        _health_cache = (time.monotonic() + HEALTH_CACHE_TTL, response.get_data())
+        
+        return add_security_headers(response)
         
     except Exception as e:
         return error_handler.create_error_response(
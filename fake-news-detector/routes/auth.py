@@ -3,9 +3,9 @@ Authentication routes - registration, login, logout, OAuth
 """
 from flask import Blueprint, request, jsonify, session, redirect
 from flask_login import login_user, logout_user, login_required, current_user
-from models.user import User, db
-from services.auth_service import auth_service
+from services.auth_service import auth_service, LoginThrottledError
 from services.oauth_service import oauth_service
+from services.security import security_validator
 import logging
 import secrets
 
@@ -67,7 +67,12 @@ def login():
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
         # Authenticate user
-        user, error = auth_service.login_user(email, password)
+        try:
+            user, error = auth_service.login_user(
+                email, password, client_ip=security_validator.get_client_ip(request)
+            )
+        except LoginThrottledError as e:
+            return jsonify({'success': False, 'error': str(e)}), 429
         
         if error:
             return jsonify({'success': False, 'error': error}), 401
@@ -138,7 +143,7 @@ def google_oauth_callback():
         state = request.args.get('state')
         stored_state = session.get('oauth_state')
         
-        if not state or state != stored_state:
+        if not state or not stored_state or not secrets.compare_digest(state.encode('utf-8'), stored_state.encode('utf-8')):
             logger.warning("OAuth state mismatch - possible CSRF attack")
             return jsonify({'success': False, 'error': 'Invalid state parameter'}), 400
         
@@ -1,51 +1,105 @@
 """
 Analysis history routes
 """
-from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import Blueprint, current_app, has_app_context, request, jsonify
 from flask_login import login_required, current_user
+from config import Config
 from models.user import db
 from models.user_analysis import UserAnalysis
-from datetime import datetime
+from sqlalchemy import and_, func, or_
 
 history_bp = Blueprint('history', __name__, url_prefix='/api/history')
 
+# Upper bound on page size so a single request can't pull a user's entire history
+MAX_PER_PAGE = 100
+
+# Writes history rows queued by analyze routes; a single writer keeps the
+# inserts in order and off the request thread
+_history_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='history-writer')
+
 @history_bp.route('/', methods=['GET'])
 @login_required
 def get_history():
     """Get user's analysis history"""
     try:
         # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_PER_PAGE)
         
         # Get filter parameters
         input_type = request.args.get('type', None)  # 'url' or 'text'
         verdict = request.args.get('verdict', None)  # 'REAL', 'FAKE', 'UNCERTAIN'
         
-        # Build query
-        query = UserAnalysis.query.filter_by(user_id=current_user.id)
+        # Keyset cursor (next_cursor of the previous page): "<created_at>_<id>"
+        cursor = request.args.get('cursor', None)
+        if cursor:
+            try:
+                cursor_created_at, _, cursor_id = cursor.rpartition('_')
+                cursor_created_at = datetime.fromisoformat(cursor_created_at)
+                cursor_id = int(cursor_id)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        
+        # Build query over plain column rows (no ORM instances or identity-map
+        # bookkeeping per entry; the full input text is never selected)
+        query = db.session.query(*UserAnalysis.summary_columns()).filter(
+            UserAnalysis.user_id == current_user.id
+        )
         
         if input_type:
-            query = query.filter_by(input_type=input_type)
+            query = query.filter(UserAnalysis.input_type == input_type)
         
         if verdict:
-            query = query.filter_by(verdict=verdict)
-        
-        # Order by most recent first
-        query = query.order_by(UserAnalysis.created_at.desc())
-        
-        # Paginate
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            query = query.filter(UserAnalysis.verdict == verdict)
+        
+        page_query = query
+        if cursor:
+            # Seek straight past the previous page in the (user_id, created_at)
+            # index; OFFSET would walk and discard every earlier row
+            page_query = page_query.filter(or_(
+                UserAnalysis.created_at < cursor_created_at,
+                and_(UserAnalysis.created_at == cursor_created_at,
+                     UserAnalysis.id < cursor_id)
+            ))
+            offset = 0
+        else:
+            offset = (page - 1) * per_page
+        
+        # Order by most recent first (id breaks ties so the cursor is exact)
+        page_query = page_query.order_by(UserAnalysis.created_at.desc(), UserAnalysis.id.desc())
+        
+        # Paginate: one extra row tells whether another page follows
+        rows = page_query.limit(per_page + 1).offset(offset).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        
+        # The total is known without a COUNT unless there is a next page
+        # (or the page is past the end)
+        if not cursor and not has_more and (rows or page == 1):
+            total = offset + len(rows)
+        elif Config.PAGINATION_COUNT:
+            total = query.count()
+        else:
+            total = None
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = f"{last.created_at.isoformat()}_{last.id}"
         
         # Convert to dict
-        analyses = [analysis.to_dict() for analysis in pagination.items]
+        analyses = [UserAnalysis.summary_dict(row) for row in rows]
         
         return jsonify({
             'analyses': analyses,
-            'total': pagination.total,
+            'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': pagination.pages
+            'pages': -(-total // per_page) if total is not None else None,
+            'has_more': has_more,
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
@@ -57,17 +111,24 @@ def get_history():
 def get_stats():
     """Get user's analysis statistics"""
     try:
-        # Total analyses
-        total = UserAnalysis.query.filter_by(user_id=current_user.id).count()
+        # Per-verdict counts and confidence sums in a single grouped query
+        rows = db.session.query(
+            UserAnalysis.verdict,
+            func.count(UserAnalysis.id),
+            func.sum(UserAnalysis.confidence)
+        ).filter(UserAnalysis.user_id == current_user.id).group_by(UserAnalysis.verdict).all()
+        
+        counts = {verdict: count for verdict, count, _ in rows}
+        total = sum(counts.values())
         
         # Verdict distribution
-        real_count = UserAnalysis.query.filter_by(user_id=current_user.id, verdict='REAL').count()
-        fake_count = UserAnalysis.query.filter_by(user_id=current_user.id, verdict='FAKE').count()
-        uncertain_count = UserAnalysis.query.filter_by(user_id=current_user.id, verdict='UNCERTAIN').count()
+        real_count = counts.get('REAL', 0)
+        fake_count = counts.get('FAKE', 0)
+        uncertain_count = counts.get('UNCERTAIN', 0)
         
         # Average confidence
-        analyses = UserAnalysis.query.filter_by(user_id=current_user.id).all()
-        avg_confidence = sum(a.confidence for a in analyses) / len(analyses) if analyses else 0
+        confidence_sum = sum(conf_sum or 0 for _, _, conf_sum in rows)
+        avg_confidence = confidence_sum / total if total else 0
         
         return jsonify({
             'total_analyses': total,
@@ -107,15 +168,15 @@ def get_analysis(analysis_id):
 def delete_analysis(analysis_id):
     """Delete specific analysis"""
     try:
-        analysis = UserAnalysis.query.filter_by(
+        # Single DELETE statement; the row (and its full input text) is never loaded
+        deleted = UserAnalysis.query.filter_by(
             id=analysis_id,
             user_id=current_user.id
-        ).first()
+        ).delete()
         
-        if not analysis:
+        if not deleted:
             return jsonify({'error': 'Analysis not found'}), 404
         
-        db.session.delete(analysis)
         db.session.commit()
         
         return jsonify({'message': 'Analysis deleted successfully'}), 200
@@ -145,13 +206,14 @@ def save_user_analysis(user_id: int, input_type: str, input_content: str,
                        matched_articles_count: int = 0, processing_time: float = None):
     """
     Helper function to save user analysis
-    Called from analyze routes after analysis is complete
+    Called from analyze routes (through queue_user_analysis) after analysis is complete
     """
     try:
         analysis = UserAnalysis(
             user_id=user_id,
             input_type=input_type,
             input_content=input_content,
+            input_preview=UserAnalysis.preview_of(input_content),
             verdict=verdict,
             confidence=confidence,
             explanation=explanation,
@@ -168,3 +230,22 @@ def save_user_analysis(user_id: int, input_type: str, input_content: str,
         db.session.rollback()
         print(f"Failed to save user analysis: {str(e)}")
         return None
+
+
+def queue_user_analysis(**fields) -> None:
+    """
+    Save a user analysis (same arguments as save_user_analysis) in the background,
+    so an analyze response doesn't wait on the INSERT and commit
+    """
+    if not has_app_context():
+        save_user_analysis(**fields)
+        return
+    
+    app = current_app._get_current_object()
+    
+    def write():
+        # Writer thread: the session is scoped to this app context
+        with app.app_context():
+            save_user_analysis(**fields)
+    
+    _history_writer.submit(write)
@@ -4,8 +4,12 @@ Endpoints: /rag-analyze-url  /rag-analyze-text  /rag-health  /rag-metrics
 """
 
 import time
+import hashlib
+from urllib.parse import urlsplit, urlunsplit
 import logging
-from flask import Blueprint, request, jsonify
+import threading
+from collections import OrderedDict
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_login import current_user
 
 from config import Config
@@ -14,7 +18,7 @@ from services.extractor import ContentExtractor, ArticleContent
 from services.security import security_validator
 from services.error_handler import error_handler, ErrorType
 from services.logger import performance_logger
-from routes.history import save_user_analysis
+from routes.history import queue_user_analysis
 
 logger = logging.getLogger("fake_news_detector.rag_route")
 
@@ -36,9 +40,53 @@ def get_rag_pipeline() -> RAGPipeline:
 
 
 def _sec(response):
-    for k, v in security_validator.get_security_headers().items():
-        response.headers[k] = v
-    return response
+    return security_validator.apply_security_headers(response)
+
+
+# ── Result cache ────────────────────────────────────────────────────────────
+
+# Recent pipeline results keyed by a hash of the URL or normalized text, so a
+# re-submitted article (users often retry) skips the LLM and news lookups.
+# Kept short-lived because the retrieved evidence comes from live news.
+RAG_RESULT_CACHE_SIZE = 256
+RAG_RESULT_CACHE_TTL = 900  # seconds
+_rag_result_cache = OrderedDict()  # key -> (expires_at, result, payload)
+_rag_result_cache_lock = threading.Lock()
+
+
+def _rag_cache_key(kind: str, value: str) -> str:
+    normalized = " ".join(value.split())
+    if kind == "url":
+        # Scheme and host are case-insensitive; path and query are not
+        parts = urlsplit(normalized)
+        normalized = urlunsplit(parts._replace(scheme=parts.scheme.lower(),
+                                               netloc=parts.netloc.lower()))
+    return kind + ":" + hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_cached_rag_result(key: str):
+    """(result, payload) for a fresh cache entry, else None"""
+    with _rag_result_cache_lock:
+        entry = _rag_result_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del _rag_result_cache[key]
+            return None
+        _rag_result_cache.move_to_end(key)
+        return entry[1], {**entry[2], "from_cache": True}
+
+
+def _store_rag_result(key: str, result, payload: dict) -> None:
+    # Results from a fallback path (no evidence, LLM unavailable) reflect a
+    # transient outage, so they are not served to later submissions
+    if result.degraded:
+        return
+    with _rag_result_cache_lock:
+        _rag_result_cache[key] = (time.monotonic() + RAG_RESULT_CACHE_TTL, result, payload)
+        _rag_result_cache.move_to_end(key)
+        while len(_rag_result_cache) > RAG_RESULT_CACHE_SIZE:
+            _rag_result_cache.popitem(last=False)
 
 
 # ── /rag-analyze-url ────────────────────────────────────────────────────────
@@ -70,22 +118,28 @@ def rag_analyze_url():
         url = vr["sanitized_data"]["url"]
         logger.info(f"[{perf_id}] RAG URL analysis: {url}")
 
-        extractor = ContentExtractor(timeout=Config.REQUEST_TIMEOUT)
-        try:
-            article = extractor.extract_content(url)
-        except ValueError as e:
-            return error_handler.create_error_response(
-                e, ErrorType.VALIDATION_ERROR, perf_id,
-                {"step": "content_extraction"}, processing_time=time.time() - t0)
+        cache_key = _rag_cache_key("url", url)
+        cached = _get_cached_rag_result(cache_key)
+        if cached is not None:
+            result, payload = cached
+        else:
+            extractor = ContentExtractor(timeout=Config.REQUEST_TIMEOUT)
+            try:
+                article = extractor.extract_content(url)
+            except ValueError as e:
+                return error_handler.create_error_response(
+                    e, ErrorType.VALIDATION_ERROR, perf_id,
+                    {"step": "content_extraction"}, processing_time=time.time() - t0)
 
-        pipeline = get_rag_pipeline()
-        result   = pipeline.analyze(article)
-        payload  = pipeline.to_json(result)
+            pipeline = get_rag_pipeline()
+            result   = pipeline.analyze(article)
+            payload  = pipeline.to_json(result)
+            _store_rag_result(cache_key, result, payload)
 
         # Save to user history
         if current_user.is_authenticated:
             try:
-                save_user_analysis(
+                queue_user_analysis(
                     user_id=current_user.id,
                     input_type="url",
                     input_content=url,
@@ -142,16 +196,22 @@ def rag_analyze_text():
                 ValueError("Text too short (min 50 chars)"), ErrorType.VALIDATION_ERROR,
                 perf_id, processing_time=time.time() - t0)
 
-        title   = text.split("\n")[0][:200]
-        article = ArticleContent(title=title, content=text, url="", source="")
+        cache_key = _rag_cache_key("text", text)
+        cached = _get_cached_rag_result(cache_key)
+        if cached is not None:
+            result, payload = cached
+        else:
+            title   = text.partition("\n")[0][:200]
+            article = ArticleContent(title=title, content=text, url="", source="")
 
-        pipeline = get_rag_pipeline()
-        result   = pipeline.analyze(article)
-        payload  = pipeline.to_json(result)
+            pipeline = get_rag_pipeline()
+            result   = pipeline.analyze(article)
+            payload  = pipeline.to_json(result)
+            _store_rag_result(cache_key, result, payload)
 
         if current_user.is_authenticated:
             try:
-                save_user_analysis(
+                queue_user_analysis(
                     user_id=current_user.id,
                     input_type="text",
                     input_content=text[:500],
@@ -180,20 +240,38 @@ def rag_analyze_text():
 
 # ── /rag-health ─────────────────────────────────────────────────────────────
 
+# The pipeline's components are fixed once it is built, so the healthy
+# payload is serialized (and its ETag computed) on the first call only.
+# Stored as one (body, etag, last_modified) tuple so readers never see a mix.
+_rag_health: tuple = None
+
+
 @rag_analyze_bp.route("/rag-health", methods=["GET"])
 def rag_health():
+    global _rag_health
     try:
-        p = get_rag_pipeline()
-        return jsonify({
-            "status":   "healthy",
-            "pipeline": "RAG Pipeline v2.0 (13-step)",
-            "components": {
-                "groq_llm":          p.groq_client        is not None,
-                "news_api":          p.news_fetcher        is not None,
-                "vector_db":         p.similarity_engine   is not None,
-                "keyword_extractor": p.keyword_extractor   is not None,
-            },
-        })
+        cached = _rag_health
+        if cached is None:
+            p = get_rag_pipeline()
+            body = current_app.json.dumps({
+                "status":   "healthy",
+                "pipeline": "RAG Pipeline v2.0 (13-step)",
+                "components": {
+                    "groq_llm":          p.groq_client        is not None,
+                    "news_api":          p.news_fetcher        is not None,
+                    "vector_db":         p.similarity_engine   is not None,
+                    "keyword_extractor": p.keyword_extractor   is not None,
+                },
+            }).encode("utf-8")
+            cached = _rag_health = (
+                body, hashlib.blake2b(body, digest_size=16).hexdigest(), time.time()
+            )
+
+        body, etag, last_modified = cached
+        resp = Response(body, mimetype="application/json")
+        resp.set_etag(etag)
+        resp.last_modified = last_modified
+        return resp.make_conditional(request)
     except Exception as e:
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
 
@@ -208,16 +286,22 @@ def rag_metrics():
         from models.user import db
         from sqlalchemy import func
 
-        total = db.session.query(func.count(RAGAnalysisLog.id)).scalar() or 0
-        avg_lat = db.session.query(func.avg(RMet.latency_ms)).scalar() or 0
-        avg_acc = db.session.query(func.avg(RMet.retrieval_accuracy)).scalar() or 0
-        avg_cov = db.session.query(func.avg(RMet.evidence_coverage)).scalar() or 0
-        avg_conf= db.session.query(func.avg(RMet.confidence_score)).scalar() or 0
+        # All four averages in one pass over rag_metrics
+        avgs = db.session.query(
+            func.avg(RMet.latency_ms),
+            func.avg(RMet.retrieval_accuracy),
+            func.avg(RMet.evidence_coverage),
+            func.avg(RMet.confidence_score),
+        ).one()
+        avg_lat, avg_acc, avg_cov, avg_conf = (a or 0 for a in avgs)
 
         verdict_rows = db.session.query(
             RAGAnalysisLog.verdict,
             func.count(RAGAnalysisLog.id)
         ).group_by(RAGAnalysisLog.verdict).all()
+        verdict_distribution = {v: c for v, c in verdict_rows}
+        # verdict is NOT NULL, so the per-verdict counts sum to the row count
+        total = sum(verdict_distribution.values())
 
         return jsonify({
             "total_analyses":       total,
@@ -225,7 +309,7 @@ def rag_metrics():
             "avg_retrieval_accuracy": round(avg_acc, 4),
             "avg_evidence_coverage":  round(avg_cov, 2),
             "avg_confidence":         round(avg_conf, 2),
-            "verdict_distribution":   {v: c for v, c in verdict_rows},
+            "verdict_distribution":   verdict_distribution,
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -4,31 +4,169 @@ Integrated server serving both frontend and backend
 """
 
 import os
+import re
 import sys
-from flask import send_from_directory
+import gzip
+import hashlib
+from flask import Response, send_from_directory, abort, request
+from werkzeug.http import http_date, quote_etag
+from werkzeug.middleware.shared_data import SharedDataMiddleware
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Put this directory first on the Python path so the local app/config/services
+# packages win over same-named installed modules (and are found on the first probe)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
 
 # Import and create the backend app
 from app import create_app
+from config import Config
+from services.security import security_validator
 
 # Create the Flask app with all backend functionality
 app = create_app()
 
 # Frontend directory
-FRONTEND_DIR = os.path.join(os.path.dirname(__file__), 'frontend')
+FRONTEND_DIR = os.path.join(BASE_DIR, 'frontend')
+
+
+def _scan_frontend_files(directory, prefix=''):
+    """Relative paths (with '/' separators) of every file under the frontend directory"""
+    files = set()
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return files
+    for entry in entries:
+        if entry.is_dir():
+            files |= _scan_frontend_files(entry.path, f"{prefix}{entry.name}/")
+        elif entry.is_file():
+            files.add(f"{prefix}{entry.name}")
+    return files
+
+
+# Walked once at startup so unknown paths are rejected without touching the
+# filesystem (restart the server after adding new frontend files)
+FRONTEND_FILES = frozenset(_scan_frontend_files(FRONTEND_DIR))
+
+# Text assets are kept in memory (raw and gzip-compressed, with an ETag per
+# encoding) and reloaded only when the file's mtime changes
+TEXT_ASSET_TYPES = {
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+_asset_cache = {}
+
+
+# Elements whose contents are whitespace-sensitive (preformatted text, form
+# defaults, inline scripts with template literals) and are served verbatim
+PRESERVED_BLOCK_PATTERN = re.compile(
+    rb'<(pre|textarea|script)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL
+)
+LINE_INDENT_PATTERN = re.compile(rb'\n[ \t]+')
+
+
+def _strip_html_indentation(body):
+    """Drop per-line leading indentation from HTML (about a third of index.html's bytes)"""
+    parts = []
+    position = 0
+    for block in PRESERVED_BLOCK_PATTERN.finditer(body):
+        parts.append(LINE_INDENT_PATTERN.sub(b'\n', body[position:block.start()]))
+        parts.append(block.group(0))
+        position = block.end()
+    parts.append(LINE_INDENT_PATTERN.sub(b'\n', body[position:]))
+    return b''.join(parts).lstrip(b' \t')
+
+
+def _asset_headers(mimetype, etag, last_modified, content_encoding=None):
+    """Response headers for one encoding of a cached asset, built once per file version"""
+    headers = [
+        ('Content-Type', f'{mimetype}; charset=utf-8'),
+        ('ETag', quote_etag(etag)),
+        ('Last-Modified', http_date(last_modified)),
+        ('Vary', 'Accept-Encoding'),
+        # Always revalidate, but let an unchanged file (matching If-None-Match or
+        # If-Modified-Since) come back as a bodiless 304
+        ('Cache-Control', 'no-cache, must-revalidate'),
+    ]
+    if content_encoding:
+        headers.append(('Content-Encoding', content_encoding))
+    return tuple(headers)
+
+
+def _load_asset(filename):
+    """Cached entry for a frontend text asset, re-reading the file only after it changes"""
+    path = os.path.join(FRONTEND_DIR, *filename.split('/'))
+    stat = os.stat(path)
+    mtime = stat.st_mtime_ns
+    entry = _asset_cache.get(filename)
+    if entry is None or entry['mtime'] != mtime:
+        with open(path, 'rb') as f:
+            body = f.read()
+        if filename.endswith('.html'):
+            body = _strip_html_indentation(body)
+        mimetype = TEXT_ASSET_TYPES[os.path.splitext(filename)[1]]
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        # One (body, headers) pair per encoding token, so a request only picks
+        # an encoding instead of formatting dates and ETags every time
+        entry = {
+            'mtime': mtime,
+            'gzip': (gzip.compress(body, compresslevel=9),
+                     _asset_headers(mimetype, etag + '-gz', stat.st_mtime, 'gzip')),
+            'identity': (body, _asset_headers(mimetype, etag, stat.st_mtime)),
+        }
+        _asset_cache[filename] = entry
+    return entry
+
+
+def _asset_response(filename):
+    """Serve a cached text asset, gzip-encoded when the client accepts it"""
+    entry = _load_asset(filename)
+    encoding = 'gzip' if request.accept_encodings['gzip'] else 'identity'
+    body, headers = entry[encoding]
+    # A fresh Response per request: after_request hooks and make_conditional
+    # mutate headers and status, so Response objects can't be shared
+    response = Response(body, headers=headers)
+    return response.make_conditional(request)
+
+
+class _SecureSharedDataMiddleware(SharedDataMiddleware):
+    """SharedDataMiddleware that also sends the security headers after_request adds"""
+    
+    SECURITY_HEADERS = tuple(security_validator.get_security_headers().items())
+    
+    def __init__(self, app, exports):
+        super().__init__(app, exports)
+        self.static_paths = frozenset(exports)
+    
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') not in self.static_paths:
+            return super().__call__(environ, start_response)
+        
+        def start_with_security_headers(status, headers, exc_info=None):
+            headers.extend(self.SECURITY_HEADERS)
+            return start_response(status, headers, exc_info)
+        
+        return super().__call__(environ, start_with_security_headers)
+
+
+# Binary assets (images, favicon) are served by Werkzeug's WSGI-level static
+# handler, which skips Flask routing and request hooks (so it sets the security
+# headers itself) and hands the file to the server's wsgi.file_wrapper
+# (sendfile under gunicorn)
+app.wsgi_app = _SecureSharedDataMiddleware(app.wsgi_app, {
+    f'/{name}': os.path.join(FRONTEND_DIR, *name.split('/'))
+    for name in FRONTEND_FILES
+    if os.path.splitext(name)[1] not in TEXT_ASSET_TYPES
+})
+
 
 # Add frontend routes to the same app
 @app.route('/')
 def serve_index():
     """Serve the main HTML file"""
-    from flask import make_response
-    response = make_response(send_from_directory(FRONTEND_DIR, 'index.html'))
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    return _asset_response('index.html')
 
 @app.route('/<path:filename>')
 def serve_static(filename):
@@ -36,19 +174,13 @@ def serve_static(filename):
     # Skip API routes - they're handled by blueprints
     if filename.startswith('api/') or filename.startswith('analyze'):
         return {'error': 'Not found'}, 404
-    from flask import make_response
-    response = make_response(send_from_directory(FRONTEND_DIR, filename))
-    # Add no-cache headers for CSS and JS files
-    if filename.endswith(('.css', '.js')):
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    # Ensure correct MIME types
-    if filename.endswith('.css'):
-        response.headers['Content-Type'] = 'text/css'
-    elif filename.endswith('.js'):
-        response.headers['Content-Type'] = 'application/javascript'
-    return response
+    if filename not in FRONTEND_FILES:
+        abort(404)
+    # HTML, CSS and JS come from the in-memory cache with the correct MIME types
+    # (other files are normally answered by SharedDataMiddleware before routing)
+    if os.path.splitext(filename)[1] in TEXT_ASSET_TYPES:
+        return _asset_response(filename)
+    return send_from_directory(FRONTEND_DIR, filename)
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -73,4 +205,6 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop the server")
     print("=" * 60)
     
-    app.run(host='127.0.0.1', port=3000, debug=True)
\ No newline at end of file
+    # The reloader re-runs this whole script (and create_app) in a child process;
+    # only pay for that second startup when FLASK_DEBUG=true asks for auto-reload
+    app.run(host='127.0.0.1', port=3000, debug=True, use_reloader=Config.DEBUG)
\ No newline at end of file
@@ -6,7 +6,7 @@ import os
 import hashlib
 import secrets
 from typing import Dict, Optional, Set
-from datetime import datetime, timedelta
+from datetime import datetime
 
 class APIKeyManager:
     """Service for managing API keys and authentication"""
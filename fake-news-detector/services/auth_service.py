@@ -1,29 +1,52 @@
 """
 Authentication service - core business logic
 """
+import hmac
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Tuple
 from models.user import User, db
 from services.password_service import password_service
 from services.email_service import email_service
 import logging
-import threading
 
 # Use standard logging
 logger = logging.getLogger('fake_news_detector.auth')
 
+# Character classes a password must each contain
+UPPERCASE_PATTERN = re.compile(r'[A-Z]')
+LOWERCASE_PATTERN = re.compile(r'[a-z]')
+DIGIT_PATTERN = re.compile(r'\d')
+SPECIAL_CHAR_PATTERN = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+class LoginThrottledError(Exception):
+    """Raised by login_user when a client has used up its failed login attempts"""
+    pass
+
 class AuthService:
     """Core authentication business logic"""
     
+    # Repeated failures from one client for one email are rejected before the user
+    # lookup and password hash, so a single client can't keep workers busy in the KDF
+    FAILED_LOGIN_LIMIT = 5
+    FAILED_LOGIN_WINDOW = 300  # seconds
+    FAILED_LOGIN_MAX_ENTRIES = 10000
+    
+    def __init__(self):
+        self._failed_logins = {}  # (client_ip, email) -> (failure_count, window_start)
+        self._failed_logins_lock = threading.Lock()
+        self._failed_logins_pruned_at = time.monotonic()
+    
     def register_user(self, email: str, password: str, name: str) -> Tuple[Optional[User], Optional[str]]:
         """
         Register new user with email/password
         Returns: (user, error_message)
         """
-        # Check if email already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
+        # Check if email already exists (id only - no need to load the full row)
+        email_taken = db.session.query(User.id).filter(User.email_matches(email)).first() is not None
+        if email_taken:
             return None, "An account with this email already exists"
         
         # Validate password strength
@@ -53,17 +76,28 @@ class AuthService:
             logger.error(f"Registration failed for {email}: {str(e)}")
             return None, "Registration failed"
     
-    def login_user(self, email: str, password: str) -> Tuple[Optional[User], Optional[str]]:
+    def login_user(self, email: str, password: str,
+                   client_ip: Optional[str] = None) -> Tuple[Optional[User], Optional[str]]:
         """
         Authenticate user with email/password
         Returns: (user, error_message)
+        Raises: LoginThrottledError if this client/email pair is throttled
         """
-        user = User.query.filter_by(email=email).first()
+        # Same answer whether or not the account exists, so this doesn't reveal emails
+        throttle_key = (client_ip, email.lower())
+        if self._is_login_throttled(throttle_key):
+            logger.warning(f"Throttled repeated failed logins for {email} from {client_ip}")
+            raise LoginThrottledError("Too many failed login attempts. Please try again later.")
+        
+        user = User.find_by_email(email)
         
         # Generic error message for security
         generic_error = "Invalid credentials"
         
         if not user:
+            # Burn a hash verification so timing matches the existing-user path
+            password_service.dummy_verify(password)
+            self._record_login_failure(throttle_key)
             logger.warning(f"Login attempt for non-existent email: {email}")
             return None, generic_error
         
@@ -75,11 +109,18 @@ class AuthService:
         # Verify password
         if not user.check_password(password):
             self.record_failed_login(user)
+            self._record_login_failure(throttle_key)
             logger.warning(f"Failed login attempt for {email}")
             return None, generic_error
         
+        # Upgrade legacy bcrypt / outdated Argon2 hashes while the plaintext is at hand
+        if password_service.needs_rehash(user.password_hash):
+            user.set_password(password)
+        
         # Successful login
         self.record_successful_login(user)
+        with self._failed_logins_lock:
+            self._failed_logins.pop(throttle_key, None)
         
         # Send login notification (synchronous for now)
         try:
@@ -114,7 +155,7 @@ class AuthService:
             return user, None
         
         # Check if email already exists (link accounts)
-        user = User.query.filter_by(email=email).first()
+        user = User.find_by_email(email)
         if user:
             # Link Google account to existing user
             user.google_id = google_id
@@ -160,20 +201,54 @@ class AuthService:
         if len(password) < 8:
             return False, "Password must be at least 8 characters long"
         
-        if not re.search(r'[A-Z]', password):
+        if not UPPERCASE_PATTERN.search(password):
             return False, "Password must contain at least one uppercase letter"
         
-        if not re.search(r'[a-z]', password):
+        if not LOWERCASE_PATTERN.search(password):
             return False, "Password must contain at least one lowercase letter"
         
-        if not re.search(r'\d', password):
+        if not DIGIT_PATTERN.search(password):
             return False, "Password must contain at least one number"
         
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not SPECIAL_CHAR_PATTERN.search(password):
             return False, "Password must contain at least one special character"
         
         return True, ""
     
+    def _is_login_throttled(self, key: tuple) -> bool:
+        """Whether a (client_ip, email) pair has used up its failed attempts for the window"""
+        with self._failed_logins_lock:
+            entry = self._failed_logins.get(key)
+            if entry is None:
+                return False
+            count, window_start = entry
+            if time.monotonic() - window_start >= self.FAILED_LOGIN_WINDOW:
+                del self._failed_logins[key]
+                return False
+            return count >= self.FAILED_LOGIN_LIMIT
+    
+    def _record_login_failure(self, key: tuple) -> None:
+        """Count a failed login for a (client_ip, email) pair"""
+        now = time.monotonic()
+        with self._failed_logins_lock:
+            count, window_start = self._failed_logins.get(key, (0, now))
+            if now - window_start >= self.FAILED_LOGIN_WINDOW:
+                count, window_start = 0, now
+            self._failed_logins[key] = (count + 1, window_start)
+            
+            # Drop expired windows once per window length, or sooner if the table is full
+            if (now - self._failed_logins_pruned_at >= self.FAILED_LOGIN_WINDOW
+                    or len(self._failed_logins) > self.FAILED_LOGIN_MAX_ENTRIES):
+                cutoff = now - self.FAILED_LOGIN_WINDOW
+                self._failed_logins = {
+                    k: v for k, v in self._failed_logins.items() if v[1] > cutoff
+                }
+                self._failed_logins_pruned_at = now
+            
+            # Still over the cap (all windows live): evict the oldest entries
+            while len(self._failed_logins) > self.FAILED_LOGIN_MAX_ENTRIES:
+                del self._failed_logins[next(iter(self._failed_logins))]
+    
     def check_account_locked(self, user: User) -> bool:
         """Check if account is temporarily locked"""
         return user.is_locked()
@@ -214,8 +289,9 @@ class AuthService:
         if not is_valid:
             return False, error_msg
         
-        # Check if new password is same as current
-        if user.check_password(new_password):
+        # Check if new password is same as current (current was just verified,
+        # so a direct comparison replaces a second hash verification)
+        if hmac.compare_digest(new_password.encode('utf-8'), current_password.encode('utf-8')):
             return False, "New password must be different from current password"
         
         # Update password
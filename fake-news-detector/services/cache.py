@@ -4,13 +4,21 @@ Caching service for analysis results
 
 import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Dict, Any
-from models.database import Database
+from models.database import Database, TEXT_KEY_PREFIX
 
 
 class CacheService:
     """Service for caching analysis results using the Database class"""
     
+    # Recently read results kept in process, so repeat submissions of hot
+    # URLs/texts skip the database round-trip
+    LOCAL_CACHE_SIZE = 1024
+    LOCAL_CACHE_TTL = 600  # seconds
+    
     def __init__(self, database: Database):
         """
         Initialize cache service with Database instance
@@ -19,6 +27,8 @@ class CacheService:
             database: Database instance for storage operations
         """
         self.database = database
+        self._local_cache = OrderedDict()  # cache key -> (expires_at, formatted result)
+        self._local_cache_lock = threading.Lock()
     
     def get_cached_result(self, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -34,19 +44,65 @@ class CacheService:
             # Generate cache key from URL
             cache_key = self._generate_cache_key(url)
             
-            # Use Database's get_analysis_by_url method
-            cached_data = self.database.get_analysis_by_url(cache_key)
-            
-            if cached_data:
-                # Convert database result to expected format
-                return self._format_cached_result(cached_data)
+            return self._lookup(cache_key)
             
+        except Exception as e:
+            print(f"Cache retrieval failed for URL {url}: {str(e)}")
             return None
+    
+    def get_cached_text_result(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve cached analysis result for previously submitted text content
+        
+        Args:
+            text: Raw text content as submitted for analysis
+            
+        Returns:
+            Cached analysis result dictionary or None if not found
+        """
+        try:
+            # Content hash shares the indexed url column with URL cache keys
+            cache_key = self._generate_content_key(text)
+            
+            return self._lookup(cache_key)
             
         except Exception as e:
-            print(f"Cache retrieval failed for URL {url}: {str(e)}")
+            print(f"Cache retrieval failed for text content: {str(e)}")
             return None
     
+    def store_text_result(self, text: str, summary: str, verdict: str,
+                          confidence: float, explanation: str = "",
+                          matched_articles: list = None,
+                          key_claims: list = None,
+                          processing_time: float = 0.0) -> bool:
+        """
+        Store analysis result for text content keyed by its content hash
+        
+        Returns:
+            True if storage successful, False otherwise
+        """
+        try:
+            cache_key = self._generate_content_key(text)
+            analysis_id = self.database.store_analysis(
+                url=cache_key,
+                summary=summary,
+                verdict=verdict,
+                confidence=confidence,
+                explanation=explanation,
+                matched_articles=matched_articles or [],
+                key_claims=key_claims or [],
+                processing_time=processing_time
+            )
+            
+            # The stored row replaces any earlier result for this key
+            self._forget(cache_key)
+            
+            return analysis_id is not None
+            
+        except Exception as e:
+            print(f"Cache storage failed for text content: {str(e)}")
+            return False
+    
     def store_result(self, url: str, summary: str, verdict: str, 
                     confidence: float, explanation: str = "", 
                     matched_articles: list = None, 
@@ -84,6 +140,9 @@ class CacheService:
                 processing_time=processing_time
             )
             
+            # The stored row replaces any earlier result for this key
+            self._forget(cache_key)
+            
             return analysis_id is not None
             
         except Exception as e:
@@ -102,13 +161,46 @@ class CacheService:
         """
         try:
             cache_key = self._generate_cache_key(url)
-            cached_data = self.database.get_analysis_by_url(cache_key)
-            return cached_data is not None
+            return self._lookup(cache_key) is not None
             
         except Exception as e:
             print(f"Cache hit check failed for URL {url}: {str(e)}")
             return False
     
+    def _lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Formatted result for a cache key, from the in-process cache when still
+        fresh, otherwise from the database (remembering the result)
+        
+        Returns:
+            A copy of the formatted result (callers may modify it) or None
+        """
+        now = time.time()
+        with self._local_cache_lock:
+            entry = self._local_cache.get(cache_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local_cache.move_to_end(cache_key)
+                    return dict(entry[1])
+                del self._local_cache[cache_key]
+        
+        cached_data = self.database.get_analysis_by_url(cache_key)
+        if not cached_data:
+            return None
+        
+        result = self._format_cached_result(cached_data)
+        with self._local_cache_lock:
+            self._local_cache[cache_key] = (now + self.LOCAL_CACHE_TTL, result)
+            self._local_cache.move_to_end(cache_key)
+            while len(self._local_cache) > self.LOCAL_CACHE_SIZE:
+                self._local_cache.popitem(last=False)
+        return dict(result)
+    
+    def _forget(self, cache_key: str) -> None:
+        """Drop a key from the in-process cache"""
+        with self._local_cache_lock:
+            self._local_cache.pop(cache_key, None)
+    
     def _generate_cache_key(self, url: str) -> str:
         """
         Generate consistent cache key from URL
@@ -117,13 +209,28 @@ class CacheService:
             url: URL to generate key for
             
         Returns:
-            MD5 hash of the URL as cache key
+            128-bit BLAKE2b hash of the URL as cache key
         """
         # Normalize URL by stripping whitespace and converting to lowercase
         normalized_url = url.strip().lower()
         
-        # Generate MD5 hash for consistent key generation
-        return hashlib.md5(normalized_url.encode('utf-8')).hexdigest()
+        # BLAKE2b (same 32-char hex length as MD5) hashes faster than MD5 on 64-bit CPUs
+        return hashlib.blake2b(normalized_url.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _generate_content_key(self, text: str) -> str:
+        """
+        Generate cache key from text content
+        
+        Args:
+            text: Text content to generate key for
+            
+        Returns:
+            Prefixed hash of the whitespace-normalized text
+        """
+        # Collapse whitespace so re-pasted copies of the same text still match
+        normalized_text = ' '.join(text.split())
+        
+        return TEXT_KEY_PREFIX + hashlib.blake2b(normalized_text.encode('utf-8'), digest_size=16).hexdigest()
     
     def _format_cached_result(self, cached_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -180,6 +287,9 @@ class CacheService:
             True if successful, False otherwise
         """
         try:
+            with self._local_cache_lock:
+                self._local_cache.clear()
+            
             # This would require a clear_all method in Database class
             # For now, we'll just return True as graceful handling
             print("Cache clear requested - would require Database.clear_all() method")
@@ -2,10 +2,14 @@
 Contradiction detection service using LLM
 """
 
+import re
 from typing import List, Dict
 from groq import Groq
 from services.extractor import ArticleContent
 
+# One "<article number>: <LABEL>" line of a batched classification response
+RELATIONSHIP_LINE_PATTERN = re.compile(r'^\W*(?:ARTICLE\s*)?(\d+)\W+(SUPPORT|CONTRADICT|UNRELATED)\b')
+
 class ContradictionChecker:
     """Service for detecting contradictions between claims and articles"""
     
@@ -34,11 +38,11 @@ class ContradictionChecker:
         try:
             contradiction_results = []
             
-            # Check each claim against top articles
+            # Check each claim against top articles, one LLM call per claim
             for claim in claims[:3]:  # Limit to top 3 claims
-                for article in articles[:5]:  # Limit to top 5 articles
-                    result = self._analyze_claim_article_relationship(claim, article)
-                    contradiction_results.append(result)
+                contradiction_results.extend(
+                    self._analyze_claim_relationships(claim, articles[:5])  # Limit to top 5 articles
+                )
             
             # Analyze results
             analysis = self._analyze_contradiction_results(contradiction_results)
@@ -55,52 +59,56 @@ class ContradictionChecker:
                 'unrelated_count': 0
             }
     
-    def _analyze_claim_article_relationship(self, claim: str, article: ArticleContent) -> Dict:
-        """Analyze relationship between a single claim and article"""
+    def _analyze_claim_relationships(self, claim: str, articles: List[ArticleContent]) -> List[Dict]:
+        """Classify a claim's relationship to each article in a single request"""
+        relationships = {}
         try:
+            article_blocks = "\n\n".join(
+                f"ARTICLE {i}: {article.title}\n{article.content[:800]}"
+                for i, article in enumerate(articles, 1)
+            )
             prompt = f"""
-            Analyze the relationship between this CLAIM and ARTICLE content.
+            Analyze the relationship between this CLAIM and each numbered ARTICLE.
             
             CLAIM: {claim}
             
-            ARTICLE: {article.title}
-            {article.content[:800]}
+            {article_blocks}
             
-            Classify the relationship as exactly one of:
+            Classify each relationship as exactly one of:
             - SUPPORT: The article supports or confirms the claim
             - CONTRADICT: The article contradicts or disputes the claim  
             - UNRELATED: The article is unrelated to the claim
             
-            Respond with only: SUPPORT, CONTRADICT, or UNRELATED
+            Respond with one line per article and nothing else, in the form:
+            1: SUPPORT
+            2: UNRELATED
             """
             
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
-                max_tokens=50
+                max_tokens=20 * len(articles)
             )
             
-            result = response.choices[0].message.content.strip().upper()
-            
-            # Validate response
-            if result not in ['SUPPORT', 'CONTRADICT', 'UNRELATED']:
-                result = 'UNRELATED'
-            
-            return {
-                'claim': claim,
-                'article_url': article.url,
-                'article_source': article.source,
-                'relationship': result
-            }
-            
-        except Exception as e:
-            return {
+            for line in response.choices[0].message.content.upper().splitlines():
+                match = RELATIONSHIP_LINE_PATTERN.match(line)
+                if match:
+                    relationships.setdefault(int(match.group(1)), match.group(2))
+                    
+        except Exception:
+            pass
+        
+        # Articles missing from (or invalid in) the response count as unrelated
+        return [
+            {
                 'claim': claim,
                 'article_url': article.url,
                 'article_source': article.source,
-                'relationship': 'UNRELATED'
+                'relationship': relationships.get(i, 'UNRELATED')
             }
+            for i, article in enumerate(articles, 1)
+        ]
     
     def _analyze_contradiction_results(self, results: List[Dict]) -> Dict:
         """Analyze overall contradiction patterns from individual results"""
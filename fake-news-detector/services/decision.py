@@ -5,7 +5,6 @@ Enhanced decision engine with credibility assessment and LLM explanation generat
 from typing import List, Dict, Optional
 from enum import Enum
 from dataclasses import dataclass
-import json
 
 class Verdict(Enum):
     REAL = "REAL"
@@ -26,11 +25,11 @@ class DecisionEngine:
     """Enhanced decision engine with credibility assessment, contradiction detection, and multi-model LLM explanations"""
     
     # Available models for explanation generation
-    MODELS = [
+    MODELS = (
         "llama-3.1-8b-instant",      # Primary: Fast and accurate
         "llama-3.2-90b-text-preview", # Secondary: Llama 3.2, very powerful
         "llama-3.3-70b-versatile",   # Tertiary: Most powerful
-    ]
+    )
     
     def __init__(self, groq_api_key: str = None):
         """Initialize enhanced decision engine with all services"""
@@ -152,7 +151,7 @@ class DecisionEngine:
             # Generate comprehensive explanation using LLM
             explanation = self._generate_comprehensive_explanation(
                 verdict, confidence, credibility_data, similarity_scores, contradiction_data, 
-                summary, claims, pattern_result, input_source
+                summary, claims, pattern_result, input_source, input_is_trusted
             )
             
             # Format matched articles (top 3)
@@ -511,7 +510,7 @@ class DecisionEngine:
                                           credibility_data: Dict, similarity_scores, 
                                           contradiction_data: Dict = None, summary: str = "", 
                                           claims: List[str] = None, pattern_result = None,
-                                          input_source: str = "") -> str:
+                                          input_source: str = "", input_is_trusted: Optional[bool] = None) -> str:
         """Generate comprehensive explanation using LLM with fallback to rule-based explanation"""
         
         # Try LLM-powered explanation first
@@ -528,7 +527,8 @@ class DecisionEngine:
         
         # Fallback to enhanced rule-based explanation
         return self._generate_enhanced_explanation(
-            verdict, credibility_data, similarity_scores, contradiction_data, pattern_result, input_source
+            verdict, credibility_data, similarity_scores, contradiction_data, pattern_result,
+            input_source, input_is_trusted
         )
     
     def _generate_llm_explanation(self, verdict: Verdict, confidence: float,
@@ -661,7 +661,8 @@ Start directly with the explanation, no labels or prefixes."""
     
     def _generate_enhanced_explanation(self, verdict: Verdict, credibility_data: Dict,
                                      similarity_scores, contradiction_data: Dict = None, 
-                                     pattern_result = None, input_source: str = "") -> str:
+                                     pattern_result = None, input_source: str = "",
+                                     input_is_trusted: Optional[bool] = None) -> str:
         """Generate enhanced human-readable explanation with credibility factors and contradictions"""
         
         trusted_support = credibility_data['trusted_matches']
@@ -672,8 +673,9 @@ Start directly with the explanation, no labels or prefixes."""
         # Count trusted sources in top matches
         trusted_sources = [score.source for score in similarity_scores[:5] if score.is_trusted]
         
-        # Check if input source is trusted
-        input_is_trusted = self._is_input_source_trusted(input_source)
+        # Check if input source is trusted (make_decision passes the value it already computed)
+        if input_is_trusted is None:
+            input_is_trusted = self._is_input_source_trusted(input_source)
         
         # Add input source information
         input_source_prefix = ""
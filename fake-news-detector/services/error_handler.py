@@ -133,9 +133,7 @@ class ErrorHandler:
         response = jsonify(response_data)
         
         # Add security headers
-        headers = security_validator.get_security_headers()
-        for header, value in headers.items():
-            response.headers[header] = value
+        security_validator.apply_security_headers(response)
         
         # Add error-specific headers
         if error_type == ErrorType.RATE_LIMIT_ERROR:
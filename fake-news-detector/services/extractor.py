@@ -2,11 +2,9 @@
 Content extraction service for news articles
 """
 
-from typing import Optional
+from typing import Optional, Tuple
 from dataclasses import dataclass
 import requests
-from newspaper import Article
-import re
 from urllib.parse import urlparse
 
 @dataclass
@@ -21,6 +19,9 @@ class ArticleContent:
 class ContentExtractor:
     """Service for extracting article content from URLs"""
     
+    # Stop reading HTML bodies after this many bytes (article markup is far smaller)
+    MAX_PAGE_BYTES = 5 * 1024 * 1024
+    
     def __init__(self, timeout: int = 10):
         self.timeout = timeout
         self.min_content_length = 200  # Minimum content length for valid articles
@@ -60,13 +61,13 @@ class ContentExtractor:
         return url
     
     # Rotate through several realistic user-agents to avoid blocks
-    _USER_AGENTS = [
+    _USER_AGENTS = (
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
         '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 '
         '(KHTML, like Gecko) Version/17.4 Safari/605.1.15',
         'Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0',
-    ]
+    )
 
     def extract_content(self, url: str) -> ArticleContent:
         """
@@ -82,7 +83,7 @@ class ContentExtractor:
 
         # --- Attempt 1: newspaper3k ---
         try:
-            from newspaper import Config as NConfig
+            from newspaper import Article, Config as NConfig
             cfg = NConfig()
             cfg.browser_user_agent = self._USER_AGENTS[0]
             cfg.request_timeout = self.timeout
@@ -116,11 +117,9 @@ class ContentExtractor:
                 'Upgrade-Insecure-Requests': '1',
                 'Cache-Control': 'max-age=0',
             }
-            resp = requests.get(url, headers=headers,
-                                timeout=self.timeout, allow_redirects=True)
-            resp.raise_for_status()
+            html, encoding = self._fetch_html(url, headers)
 
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
 
             # Remove noise
             for tag in soup(['script', 'style', 'nav', 'footer',
@@ -178,9 +177,8 @@ class ContentExtractor:
         try:
             from bs4 import BeautifulSoup
             headers = {'User-Agent': self._USER_AGENTS[0]}
-            resp = requests.get(url, headers=headers,
-                                timeout=self.timeout, allow_redirects=True)
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            html, encoding = self._fetch_html(url, headers, raise_for_status=False)
+            soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
 
             title = ""
             if soup.title:
@@ -206,6 +204,34 @@ class ContentExtractor:
             "the page may be paywalled, JavaScript-rendered, or blocking scrapers."
         )
 
+    def _fetch_html(self, url: str, headers: dict,
+                    raise_for_status: bool = True) -> Tuple[bytes, Optional[str]]:
+        """
+        Stream a page body in chunks, stopping at MAX_PAGE_BYTES instead of
+        buffering arbitrarily large responses.
+        Returns: (raw bytes, charset from the Content-Type header or None).
+        Without a header charset BeautifulSoup detects it from the markup.
+        """
+        with requests.get(url, headers=headers, timeout=self.timeout,
+                          allow_redirects=True, stream=True) as resp:
+            if raise_for_status:
+                resp.raise_for_status()
+
+            # resp.encoding falls back to ISO-8859-1 for any text/* response, so
+            # only use it when the server actually declared a charset
+            content_type = resp.headers.get('Content-Type', '').lower()
+            encoding = resp.encoding if 'charset=' in content_type else None
+
+            chunks = []
+            size = 0
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.MAX_PAGE_BYTES:
+                    break
+
+        return b''.join(chunks), encoding
+
     def _build_result(self, url: str, title: str, content: str,
                       publish_date, authors) -> ArticleContent:
         """Build ArticleContent from extracted parts."""
@@ -0,0 +1,78 @@
+"""
+Flask JSON provider that serializes responses with orjson when it is installed
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() and get_json() backed by orjson, falling back to the stdlib when needed"""
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize compact responses with orjson; indented (debug) output, or
+        payloads orjson rejects, go through Flask's default json.dumps path
+        """
+        if orjson is None or kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+
+        try:
+            return orjson.dumps(obj, default=self._default, option=self._option()).decode('utf-8')
+        except TypeError:
+            # e.g. integers wider than 64 bits, which json.dumps accepts
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """
+        jsonify(): compact responses take orjson's UTF-8 bytes as the body
+        directly, instead of decoding to str for the response to re-encode
+        """
+        indented = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or indented:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self._default, option=self._option())
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _option(self) -> int:
+        """orjson flags matching the stdlib provider's output"""
+        # Datetimes and dataclasses are handed to Flask's default() so the
+        # output matches the stdlib provider (e.g. HTTP dates, not ISO 8601).
+        # numpy scalars/arrays (similarity scores, embeddings) are encoded in C.
+        option = (orjson.OPT_PASSTHROUGH_DATETIME |
+                  orjson.OPT_PASSTHROUGH_DATACLASS |
+                  orjson.OPT_NON_STR_KEYS |
+                  orjson.OPT_SERIALIZE_NUMPY)
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def loads(self, s, **kwargs):
+        """
+        Parse request bodies (request.get_json) with orjson; anything it rejects
+        is re-parsed by the stdlib so accepted input and error messages match
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity literals, which json.loads accepts
+            return super().loads(s, **kwargs)
+    
+    @staticmethod
+    def _default(o):
+        """Numeric subclasses orjson won't encode natively, then Flask's conversions"""
+        if isinstance(o, float):
+            return float(o)
+        if isinstance(o, int):
+            return int(o)
+        return DefaultJSONProvider.default(o)
@@ -7,6 +7,10 @@ import re
 from typing import List
 from groq import Groq
 
+JSON_ARRAY_PATTERN = re.compile(r'\[.*?\]')
+LIST_NUMBERING_PATTERN = re.compile(r'^\d+\.?\s*')
+CAPITALIZED_WORD_PATTERN = re.compile(r'\b[A-Z][a-zA-Z]+\b')
+
 class KeywordExtractor:
     """Service for extracting important keywords from articles using Mistral LLM"""
     
@@ -65,7 +69,7 @@ Summary: {content[:1000]}"""
         """Parse keywords from JSON format response"""
         try:
             # Look for JSON array in the response
-            json_match = re.search(r'\[.*?\]', result)
+            json_match = JSON_ARRAY_PATTERN.search(result)
             if json_match:
                 json_str = json_match.group(0)
                 keywords_list = json.loads(json_str)
@@ -81,7 +85,7 @@ Summary: {content[:1000]}"""
         for line in result.strip().split('\n'):
             # Clean up the line
             keyword = line.strip().strip('-').strip('•').strip()
-            keyword = re.sub(r'^\d+\.?\s*', '', keyword)  # Remove numbering
+            keyword = LIST_NUMBERING_PATTERN.sub('', keyword)  # Remove numbering
             keyword = keyword.strip('"').strip("'")  # Remove quotes
             
             if keyword and len(keyword) > 2 and not self._is_stop_word(keyword):
@@ -132,7 +136,7 @@ Summary: {content[:1000]}"""
     def _simple_keyword_extraction(self, content: str) -> List[str]:
         """Fallback keyword extraction without LLM"""
         # Simple regex-based extraction focusing on proper nouns and important terms
-        words = re.findall(r'\b[A-Z][a-zA-Z]+\b', content)
+        words = CAPITALIZED_WORD_PATTERN.findall(content)
         
         # Filter out stop words and generic terms
         filtered_words = [word for word in words if not self._is_stop_word(word)]
@@ -3,9 +3,16 @@ Language detection and processing service for multi-language support
 """
 
 import re
+from collections import Counter
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+# Text cleaning patterns, compiled once at import
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+WORD_PATTERN = re.compile(r'\w+')
+
 @dataclass
 class LanguageResult:
     """Result of language detection"""
@@ -65,15 +72,23 @@ class LanguageDetector:
             }
         }
         
+        # Compile script/word patterns once instead of on every detection
+        for lang_data in self.language_patterns.values():
+            lang_data['common_words'] = tuple(word.lower() for word in lang_data['common_words'])
+            lang_data['compiled_patterns'] = [
+                re.compile(pattern, re.IGNORECASE) for pattern in lang_data.get('patterns', [])
+            ]
+        
         # Fallback confidence reduction factor
         self.fallback_confidence_factor = 0.7
     
-    def detect_language(self, text: str) -> LanguageResult:
+    def detect_language(self, text: str, text_lower: Optional[str] = None) -> LanguageResult:
         """
         Detect language of the given text
         
         Args:
             text: Text to analyze
+            text_lower: text.lower(), if the caller already has it
             
         Returns:
             LanguageResult with detected language and confidence
@@ -86,14 +101,16 @@ class LanguageDetector:
                 fallback_used=True
             )
         
-        # Clean and normalize text
-        clean_text = self._clean_text(text)
+        # Clean and normalize text, tokenizing once for every language scored below
+        clean_text = self._clean_text(text, text_lower)
+        text_length = len(clean_text.split())
+        word_counts = Counter(WORD_PATTERN.findall(clean_text))
         
         # Try to detect language using patterns
         language_scores = {}
         
         for lang_code, lang_data in self.language_patterns.items():
-            score = self._calculate_language_score(clean_text, lang_data)
+            score = self._calculate_language_score(clean_text, lang_data, text_length, word_counts)
             if score > 0:
                 language_scores[lang_code] = score
         
@@ -126,47 +143,47 @@ class LanguageDetector:
             fallback_used=fallback_used
         )
     
-    def _clean_text(self, text: str) -> str:
+    def _clean_text(self, text: str, text_lower: Optional[str] = None) -> str:
         """Clean and normalize text for language detection"""
         # Convert to lowercase
-        clean_text = text.lower()
+        clean_text = text_lower if text_lower is not None else text.lower()
         
         # Remove URLs
-        clean_text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', clean_text)
+        clean_text = URL_PATTERN.sub('', clean_text)
         
         # Remove email addresses
-        clean_text = re.sub(r'\S+@\S+', '', clean_text)
+        clean_text = EMAIL_PATTERN.sub('', clean_text)
         
         # Remove excessive whitespace
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+        clean_text = WHITESPACE_PATTERN.sub(' ', clean_text).strip()
         
         return clean_text
     
-    def _calculate_language_score(self, text: str, lang_data: Dict) -> float:
+    def _calculate_language_score(self, text: str, lang_data: Dict, text_length: Optional[int] = None,
+                                  word_counts: Optional[Counter] = None) -> float:
         """Calculate language score based on patterns and common words"""
         score = 0.0
-        text_length = len(text.split())
+        if text_length is None:
+            text_length = len(text.split())
         
         if text_length == 0:
             return 0.0
         
-        # Check common words
-        common_words = lang_data.get('common_words', [])
-        word_matches = 0
-        
-        for word in common_words:
-            # Count occurrences of common words
-            word_count = len(re.findall(r'\b' + re.escape(word.lower()) + r'\b', text))
-            word_matches += word_count
+        # Count occurrences of common words by lookup in the text's word counts
+        # (one tokenizing pass shared by all languages, not a regex scan per word)
+        if word_counts is None:
+            word_counts = Counter(WORD_PATTERN.findall(text))
+        common_words = lang_data.get('common_words', ())
+        word_matches = sum(word_counts[word] for word in common_words)
         
         # Calculate word-based score
         word_score = min(word_matches / text_length, 0.8)
         score += word_score
         
         # Check patterns (for script-based languages)
-        patterns = lang_data.get('patterns', [])
+        patterns = lang_data.get('compiled_patterns', [])
         for pattern in patterns:
-            matches = len(re.findall(pattern, text, re.IGNORECASE))
+            matches = len(pattern.findall(text))
             if matches > 0:
                 pattern_score = min(matches / max(text_length, 10), 0.6)
                 score += pattern_score
@@ -3,25 +3,34 @@ Comprehensive logging system for fake news detection backend
 """
 
 import logging
+import threading
 import time
-import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# logs/ next to app.py, whatever directory the server was started from
+LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
+
 class PerformanceLogger:
     """Service for tracking processing steps, timing, and performance metrics"""
     
+    # Metrics are kept for the most recent requests only; the oldest entry is
+    # dropped when a new analysis starts, so memory stays bounded
+    MAX_TRACKED_REQUESTS = 1000
+    
     def __init__(self, log_level: str = "INFO", log_file: str = "fake_news_detector.log"):
         """Initialize logging system"""
         self.log_file = log_file
         self.setup_logging(log_level)
-        self.performance_metrics = {}
+        self.performance_metrics = OrderedDict()  # request_id -> metrics, oldest first
+        self._metrics_lock = threading.Lock()
         
     def setup_logging(self, log_level: str):
         """Set up logging configuration"""
         # Create logs directory if it doesn't exist
-        log_dir = Path("logs")
+        log_dir = LOG_DIR
         log_dir.mkdir(exist_ok=True)
         
         # Configure logging
@@ -56,13 +65,16 @@ class PerformanceLogger:
         if not request_id:
             request_id = f"req_{int(time.time() * 1000)}"
         
-        self.performance_metrics[request_id] = {
-            'url': url,
-            'start_time': time.time(),
-            'steps': {},
-            'errors': [],
-            'status': 'started'
-        }
+        with self._metrics_lock:
+            self.performance_metrics[request_id] = {
+                'url': url,
+                'start_time': time.time(),
+                'steps': {},
+                'errors': [],
+                'status': 'started'
+            }
+            while len(self.performance_metrics) > self.MAX_TRACKED_REQUESTS:
+                self.performance_metrics.popitem(last=False)
         
         self.logger.info(f"[{request_id}] Analysis started for URL: {url}")
         return request_id
@@ -74,8 +86,11 @@ class PerformanceLogger:
             self.logger.warning(f"Request ID {request_id} not found in metrics")
             return
         
+        # One clock read per step, shared by the step and any error entry
+        timestamp = datetime.now().isoformat()
+        
         step_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'duration': duration,
             'details': details or {},
             'error': error
@@ -87,7 +102,7 @@ class PerformanceLogger:
             self.performance_metrics[request_id]['errors'].append({
                 'step': step_name,
                 'error': error,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             })
             self.logger.error(f"[{request_id}] {step_name} failed: {error}")
         else:
@@ -176,7 +191,9 @@ class PerformanceLogger:
     
     def _log_performance_summary(self, request_id: str):
         """Log performance summary for analysis"""
-        metrics = self.performance_metrics[request_id]
+        metrics = self.performance_metrics.get(request_id)
+        if metrics is None:
+            return
         
         # Calculate step timings
         step_timings = {}
@@ -221,13 +238,14 @@ class PerformanceLogger:
         current_time = time.time()
         cutoff_time = current_time - (max_age_hours * 3600)
         
-        old_requests = []
-        for request_id, metrics in self.performance_metrics.items():
-            if metrics.get('start_time', current_time) < cutoff_time:
-                old_requests.append(request_id)
-        
-        for request_id in old_requests:
-            del self.performance_metrics[request_id]
+        with self._metrics_lock:
+            old_requests = []
+            for request_id, metrics in self.performance_metrics.items():
+                if metrics.get('start_time', current_time) < cutoff_time:
+                    old_requests.append(request_id)
+            
+            for request_id in old_requests:
+                del self.performance_metrics[request_id]
         
         if old_requests:
             self.logger.info(f"Cleared {len(old_requests)} old metric entries")
@@ -3,11 +3,94 @@ News fetching service using News API with enhanced query optimization and retry
 """
 
 from typing import List, Dict, Optional
+import logging
 import requests
 import time
 import random
 import re
 from services.extractor import ArticleContent
+from services.trusted_sources import CORE_TRUSTED_SOURCES, compile_source_pattern
+
+logger = logging.getLogger('fake_news_detector.news_fetcher')
+
+# Words ignored when building NewsAPI search queries
+QUERY_STOP_WORDS = frozenset({
+    'the','a','an','and','or','but','in','on','at','to','for','of',
+    'is','was','are','were','be','been','that','this','with','from',
+    'by','as','it','its','will','has','have','had','not','no','can',
+    'said','says','would','could','should','may','might','also','just',
+    'after','before','during','about','into','through','between','among',
+    'big','major','top','new','old','first','last','more','most','some',
+    'any','all','both','each','few','many','much','other','same','such',
+})
+
+# Trusted news domains, passed to NewsAPI's `domains` parameter
+TRUSTED_DOMAINS = (
+    # International Trusted Sources
+    'bbc.com', 'bbc.co.uk', 'reuters.com', 'ap.org', 'apnews.com',
+    'cnn.com', 'npr.org', 'theguardian.com', 'nytimes.com', 
+    'washingtonpost.com', 'wsj.com', 'bloomberg.com',
+    'aljazeera.com', 'france24.com', 'dw.com',
+
+    # Major Indian News Sources (Most Popular & Trusted)
+    'thehindu.com', 'indianexpress.com', 'timesofindia.indiatimes.com',
+    'hindustantimes.com', 'ndtv.com', 'indiatoday.in',
+    'news18.com', 'firstpost.com', 'thequint.com',
+    'scroll.in', 'theprint.in', 'livemint.com', 'moneycontrol.com',
+
+    # Regional Indian News
+    'deccanherald.com', 'telegraphindia.com', 'tribuneindia.com',
+    'theweek.in', 'outlookindia.com', 'businesstoday.in',
+    'financialexpress.com', 'economictimes.indiatimes.com',
+
+    # News Agencies
+    'pti.org.in', 'ani.in', 'ians.in'
+)
+TRUSTED_DOMAINS_PARAM = ','.join(TRUSTED_DOMAINS)
+
+# Substrings of source names treated as trusted news organizations
+TRUSTED_SOURCES = CORE_TRUSTED_SOURCES | {
+    # International Trusted Sources
+    'ap news', 'guardian', 'nyt', 'wsj', 'al jazeera', 'france 24', 'dw',
+
+    # Indian News Sources (short names and spellings)
+    'hindu', 'toi', 'quint', 'print', 'money control',
+
+    # Regional Indian News
+    'telegraph', 'tribune', 'the week', 'outlook',
+    'business today', 'financial express',
+
+    # News Agencies
+    'pti', 'press trust of india', 'ani', 'asian news international', 'ians'
+}
+TRUSTED_SOURCE_PATTERN = compile_source_pattern(TRUSTED_SOURCES)
+
+# Markers of removed, paywalled or promotional articles
+LOW_QUALITY_INDICATORS = (
+    '[removed]', '[deleted]', 'subscribe to read',
+    'sign up to continue', 'paywall', 'premium content'
+)
+NON_NEWS_INDICATORS = (
+    'advertisement', 'sponsored', 'promoted', 'ad:',
+    'buy now', 'shop', 'sale', 'discount'
+)
+
+# Regexes used while building queries and cleaning NewsAPI results
+PROPER_NOUN_PATTERN = re.compile(r'\b[A-Z][a-zA-Z]{2,}\b')
+QUERY_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')
+# Filler phrases dropped from key-phrase extraction, as one alternation (one pass)
+FILLER_PHRASE_PATTERN = re.compile(
+    r'\b(according to|reports suggest|it is believed|sources say|allegedly'
+    r'|in conclusion|furthermore|moreover|however|therefore'
+    r'|the article|this article|the report|this report)\b',
+    re.IGNORECASE
+)
+SPECIFIC_SENTENCE_PATTERN = re.compile(r'[A-Z][a-z]+|[0-9]+|\b(in|at|from|to)\s+[A-Z]')
+DIGIT_PATTERN = re.compile(r'[0-9]')
+TRUNCATION_MARKER_PATTERN = re.compile(r'\s*\[\+\d+\s+chars\]$')
+TRAILING_ELLIPSIS_PATTERN = re.compile(r'\s*\.\.\.$')
+DOMAIN_SUFFIX_PATTERN = re.compile(r'\.(com|org|net)$', re.IGNORECASE)
+OUTLET_SUFFIX_PATTERN = re.compile(r'\s+(News|Media|Press)$', re.IGNORECASE)
 
 class NewsFetcher:
     """Service for fetching related news articles from multiple sources with fallback"""
@@ -23,6 +106,10 @@ class NewsFetcher:
         self.min_request_interval = 1  # 1 second between requests
         self.max_retries = 3
         self.base_delay = 1  # Base delay for exponential backoff
+        # Keep-alive session so retries and query variants reuse the TLS connection
+        self.session = requests.Session()
+        # (connect, read): fail fast when NewsAPI is unreachable, allow slow responses
+        self.request_timeout = (3.05, 10)
         
         # Initialize SerpAPI if key is provided
         self.serpapi_fetcher = None
@@ -30,9 +117,9 @@ class NewsFetcher:
             try:
                 from services.serpapi_fetcher import SerpAPIFetcher
                 self.serpapi_fetcher = SerpAPIFetcher(serpapi_key, limit)
-                print("✓ SerpAPI (Google News) initialized")
+                logger.info("✓ SerpAPI (Google News) initialized")
             except Exception as e:
-                print(f"SerpAPI initialization failed: {str(e)}")
+                logger.warning("SerpAPI initialization failed: %s", e)
     
     def fetch_related_news(self, query: str, keywords: List[str] = None) -> List[ArticleContent]:
         """
@@ -51,28 +138,28 @@ class NewsFetcher:
         # Try SerpAPI first (Google News - best coverage)
         if self.serpapi_fetcher:
             try:
-                print(f"Trying SerpAPI (Google News) with query: {query[:100]}...")
-                print(f"Keywords: {keywords}")
+                logger.info("Trying SerpAPI (Google News) with query: %.100s...", query)
+                logger.debug("Keywords: %s", keywords)
                 articles = self.serpapi_fetcher.fetch_google_news(query, keywords)
                 
                 if articles and len(articles) > 0:
-                    print(f"✓ SerpAPI returned {len(articles)} articles")
+                    logger.info("✓ SerpAPI returned %d articles", len(articles))
                     return articles
                 else:
-                    print("⚠ SerpAPI returned 0 articles, falling back to NewsAPI...")
+                    logger.info("⚠ SerpAPI returned 0 articles, falling back to NewsAPI...")
             except Exception as e:
-                print(f"✗ SerpAPI failed: {str(e)}, falling back to NewsAPI...")
+                logger.warning("✗ SerpAPI failed: %s, falling back to NewsAPI...", e)
         else:
-            print("⚠ SerpAPI not initialized, using NewsAPI...")
+            logger.info("⚠ SerpAPI not initialized, using NewsAPI...")
         
         # Fallback to NewsAPI
-        print("Using NewsAPI...")
+        logger.info("Using NewsAPI...")
         articles = self._fetch_from_newsapi(query, keywords)
         
         if articles:
-            print(f"✓ NewsAPI returned {len(articles)} articles")
+            logger.info("✓ NewsAPI returned %d articles", len(articles))
         else:
-            print("✗ No articles found from any source")
+            logger.info("✗ No articles found from any source")
         
         return articles
     
@@ -104,13 +191,13 @@ class NewsFetcher:
                         'excludeDomains': 'facebook.com,twitter.com,instagram.com,reddit.com',
                     }
 
-                    response = requests.get(self.base_url, params=params, timeout=10)
+                    response = self.session.get(self.base_url, params=params, timeout=self.request_timeout)
                     response.raise_for_status()
                     data = response.json()
 
                     if data.get('status') != 'ok':
                         error_msg = data.get('message', 'Unknown error')
-                        print(f"News API error (query='{search_query}'): {error_msg}")
+                        logger.warning("News API error (query='%s'): %s", search_query, error_msg)
                         break  # Try next query variant
 
                     raw_articles = []
@@ -119,30 +206,30 @@ class NewsFetcher:
                             raw_articles.append(self._convert_to_article_content(article_data))
 
                     if raw_articles:
-                        print(f"✓ NewsAPI returned {len(raw_articles)} articles for query: '{search_query}'")
+                        logger.info("✓ NewsAPI returned %d articles for query: '%s'", len(raw_articles), search_query)
                         return self._filter_and_rank_articles(raw_articles, query, keywords)[:self.limit]
 
-                    print(f"⚠ NewsAPI returned 0 articles for query: '{search_query}'")
+                    logger.info("⚠ NewsAPI returned 0 articles for query: '%s'", search_query)
                     break  # 0 results — try next query variant
 
                 except requests.exceptions.RequestException as e:
                     if attempt < self.max_retries:
                         delay = self._calculate_backoff_delay(attempt)
-                        print(f"Network error (attempt {attempt+1}): {e}, retrying in {delay:.1f}s...")
+                        logger.warning("Network error (attempt %d): %s, retrying in %.1fs...", attempt + 1, e, delay)
                         time.sleep(delay)
                     else:
-                        print(f"News fetching failed after {self.max_retries+1} attempts: {e}")
+                        logger.error("News fetching failed after %d attempts: %s", self.max_retries + 1, e)
                         return []
                 except Exception as e:
                     if attempt < self.max_retries:
                         delay = self._calculate_backoff_delay(attempt)
-                        print(f"Error (attempt {attempt+1}): {e}, retrying in {delay:.1f}s...")
+                        logger.warning("Error (attempt %d): %s, retrying in %.1fs...", attempt + 1, e, delay)
                         time.sleep(delay)
                     else:
-                        print(f"News fetching failed: {e}")
+                        logger.error("News fetching failed: %s", e)
                         return []
 
-        print("✗ No articles found from NewsAPI after all query variants")
+        logger.info("✗ No articles found from NewsAPI after all query variants")
         return []
     
     def _build_optimized_search_query(self, query: str, keywords: List[str] = None) -> str:
@@ -153,29 +240,19 @@ class NewsFetcher:
           1. Extract proper nouns + key terms from the query (up to 6 words)
           2. Supplement with provided keywords if needed
         """
-        stop_words = {
-            'the','a','an','and','or','but','in','on','at','to','for','of',
-            'is','was','are','were','be','been','that','this','with','from',
-            'by','as','it','its','will','has','have','had','not','no','can',
-            'said','says','would','could','should','may','might','also','just',
-            'after','before','during','about','into','through','between','among',
-            'big','major','top','new','old','first','last','more','most','some',
-            'any','all','both','each','few','many','much','other','same','such',
-        }
-
         # Collect candidate terms from query
         candidates = []
 
         # Prefer proper nouns (capitalized mid-sentence) — highest signal
-        proper_nouns = re.findall(r'\b[A-Z][a-zA-Z]{2,}\b', query)
+        proper_nouns = PROPER_NOUN_PATTERN.findall(query)
         for w in proper_nouns:
-            if w.lower() not in stop_words and w not in candidates:
+            if w.lower() not in QUERY_STOP_WORDS and w not in candidates:
                 candidates.append(w)
 
         # Add meaningful lowercase words
-        all_words = re.findall(r'\b[a-zA-Z]{4,}\b', query)
+        all_words = QUERY_WORD_PATTERN.findall(query)
         for w in all_words:
-            if w.lower() not in stop_words and w not in candidates:
+            if w.lower() not in QUERY_STOP_WORDS and w not in candidates:
                 candidates.append(w)
 
         # Supplement with provided keywords (already extracted by LLM)
@@ -197,15 +274,7 @@ class NewsFetcher:
     def _extract_key_phrases(self, text: str) -> str:
         """Extract key phrases from text, removing filler words and focusing on important content"""
         # Remove common filler phrases
-        filler_patterns = [
-            r'\b(according to|reports suggest|it is believed|sources say|allegedly)\b',
-            r'\b(in conclusion|furthermore|moreover|however|therefore)\b',
-            r'\b(the article|this article|the report|this report)\b'
-        ]
-        
-        cleaned_text = text
-        for pattern in filler_patterns:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE)
+        cleaned_text = FILLER_PHRASE_PATTERN.sub('', text)
         
         # Extract sentences with important keywords (who, what, where, when)
         important_sentences = []
@@ -215,7 +284,7 @@ class NewsFetcher:
             sentence = sentence.strip()
             if len(sentence) > 20:  # Skip very short sentences
                 # Prioritize sentences with proper nouns, numbers, or locations
-                if re.search(r'[A-Z][a-z]+|[0-9]+|\b(in|at|from|to)\s+[A-Z]', sentence):
+                if SPECIFIC_SENTENCE_PATTERN.search(sentence):
                     important_sentences.append(sentence)
         
         return '. '.join(important_sentences) if important_sentences else cleaned_text
@@ -246,7 +315,7 @@ class NewsFetcher:
                 score += 1
             
             # Higher score for keywords with numbers (dates, statistics)
-            if re.search(r'[0-9]', keyword):
+            if DIGIT_PATTERN.search(keyword):
                 score += 2
             
             keyword_scores.append((keyword, score))
@@ -257,28 +326,7 @@ class NewsFetcher:
     
     def _get_trusted_domains(self) -> str:
         """Get comma-separated list of trusted news domains for better results"""
-        trusted_domains = [
-            # International Trusted Sources
-            'bbc.com', 'bbc.co.uk', 'reuters.com', 'ap.org', 'apnews.com',
-            'cnn.com', 'npr.org', 'theguardian.com', 'nytimes.com', 
-            'washingtonpost.com', 'wsj.com', 'bloomberg.com',
-            'aljazeera.com', 'france24.com', 'dw.com',
-            
-            # Major Indian News Sources (Most Popular & Trusted)
-            'thehindu.com', 'indianexpress.com', 'timesofindia.indiatimes.com',
-            'hindustantimes.com', 'ndtv.com', 'indiatoday.in',
-            'news18.com', 'firstpost.com', 'thequint.com',
-            'scroll.in', 'theprint.in', 'livemint.com', 'moneycontrol.com',
-            
-            # Regional Indian News
-            'deccanherald.com', 'telegraphindia.com', 'tribuneindia.com',
-            'theweek.in', 'outlookindia.com', 'businesstoday.in',
-            'financialexpress.com', 'economictimes.indiatimes.com',
-            
-            # News Agencies
-            'pti.org.in', 'ani.in', 'ians.in'
-        ]
-        return ','.join(trusted_domains)
+        return TRUSTED_DOMAINS_PARAM
     
     def _filter_and_rank_articles(self, articles: List[ArticleContent], query: str, keywords: List[str] = None) -> List[ArticleContent]:
         """Filter and rank articles by relevance to the original query"""
@@ -327,28 +375,7 @@ class NewsFetcher:
     
     def _is_trusted_source(self, source: str) -> bool:
         """Check if source is from a trusted news organization"""
-        trusted_sources = {
-            # International Trusted Sources
-            'bbc', 'reuters', 'associated press', 'ap news', 'cnn', 'npr',
-            'the guardian', 'guardian', 'new york times', 'nyt', 'washington post',
-            'wall street journal', 'wsj', 'bloomberg', 'al jazeera', 'france 24', 'dw',
-            
-            # Major Indian News Sources (Most Popular & Trusted)
-            'the hindu', 'hindu', 'indian express', 'times of india', 'toi',
-            'hindustan times', 'ndtv', 'india today', 'news18', 'firstpost',
-            'the quint', 'quint', 'scroll', 'the print', 'print', 'mint', 'livemint',
-            'moneycontrol', 'money control',
-            
-            # Regional Indian News
-            'deccan herald', 'telegraph', 'tribune', 'the week', 'outlook',
-            'business today', 'financial express', 'economic times',
-            
-            # News Agencies
-            'pti', 'press trust of india', 'ani', 'asian news international', 'ians'
-        }
-        
-        source_lower = source.lower()
-        return any(trusted in source_lower for trusted in trusted_sources)
+        return TRUSTED_SOURCE_PATTERN.search(source.lower()) is not None
     
     def _calculate_backoff_delay(self, attempt: int) -> float:
         """Calculate exponential backoff delay with jitter"""
@@ -395,22 +422,12 @@ class NewsFetcher:
             return False
         
         # Filter out low-quality content
-        low_quality_indicators = [
-            '[removed]', '[deleted]', 'subscribe to read',
-            'sign up to continue', 'paywall', 'premium content'
-        ]
-        
         content_lower = (title + ' ' + description).lower()
-        if any(indicator in content_lower for indicator in low_quality_indicators):
+        if any(indicator in content_lower for indicator in LOW_QUALITY_INDICATORS):
             return False
         
         # Filter out non-news content
-        non_news_indicators = [
-            'advertisement', 'sponsored', 'promoted', 'ad:',
-            'buy now', 'shop', 'sale', 'discount'
-        ]
-        
-        if any(indicator in content_lower for indicator in non_news_indicators):
+        if any(indicator in content_lower for indicator in NON_NEWS_INDICATORS):
             return False
         
         return True
@@ -424,8 +441,8 @@ class NewsFetcher:
         # Use description as primary content, append content if it adds value
         if content and content != description and len(content) > len(description):
             # Remove common truncation indicators from content
-            content = re.sub(r'\s*\[\+\d+\s+chars\]$', '', content)
-            content = re.sub(r'\s*\.\.\.$', '', content)
+            content = TRUNCATION_MARKER_PATTERN.sub('', content)
+            content = TRAILING_ELLIPSIS_PATTERN.sub('', content)
             combined_content = f"{description} {content}".strip()
         else:
             combined_content = description
@@ -433,8 +450,8 @@ class NewsFetcher:
         # Clean up source name
         source_name = article_data['source']['name']
         # Remove common suffixes like ".com", "News", etc.
-        source_name = re.sub(r'\.(com|org|net)$', '', source_name, flags=re.IGNORECASE)
-        source_name = re.sub(r'\s+(News|Media|Press)$', '', source_name, flags=re.IGNORECASE)
+        source_name = DOMAIN_SUFFIX_PATTERN.sub('', source_name)
+        source_name = OUTLET_SUFFIX_PATTERN.sub('', source_name)
         
         return ArticleContent(
             title=article_data['title'].strip(),
@@ -83,7 +83,7 @@ class OAuthService:
         return {
             'id': user_info.get('id'),
             'email': user_info.get('email'),
-            'name': user_info.get('name', user_info.get('email', '').split('@')[0])
+            'name': user_info['name'] if 'name' in user_info else user_info.get('email', '').split('@')[0]
         }
 
 # Global instance
@@ -1,18 +1,43 @@
 """
-Password hashing and verification service using bcrypt
+Password hashing and verification service using Argon2id (bcrypt for legacy hashes)
 """
+import secrets
 import bcrypt
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
 class PasswordService:
-    """Password hashing and verification using bcrypt"""
+    """Password hashing and verification using Argon2id, falling back to bcrypt"""
     
     BCRYPT_ROUNDS = 12  # Work factor
     
+    # Argon2id parameters (OWASP: m=19 MiB, t=2, p=1)
+    ARGON2_TIME_COST = 2
+    ARGON2_MEMORY_COST = 19456  # KiB
+    ARGON2_PARALLELISM = 1
+    
+    def __init__(self):
+        self._dummy_hash = None
+        self.argon2 = None
+        if PasswordHasher is not None:
+            self.argon2 = PasswordHasher(
+                time_cost=self.ARGON2_TIME_COST,
+                memory_cost=self.ARGON2_MEMORY_COST,
+                parallelism=self.ARGON2_PARALLELISM
+            )
+    
     def hash_password(self, password: str) -> str:
         """
-        Hash password using bcrypt with salt
-        Returns: bcrypt hash string
+        Hash password using Argon2id (bcrypt if argon2-cffi is not installed)
+        Returns: encoded hash string
         """
+        if self.argon2 is not None:
+            return self.argon2.hash(password)
+
         password_bytes = password.encode('utf-8')
         salt = bcrypt.gensalt(rounds=self.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
@@ -20,15 +45,48 @@ class PasswordService:
     
     def verify_password(self, password: str, password_hash: str) -> bool:
         """
-        Verify password against hash using constant-time comparison
+        Verify password against an Argon2id or bcrypt hash using constant-time comparison
         Returns: True if password matches
         """
         try:
+            if password_hash.startswith('$argon2'):
+                if self.argon2 is None:
+                    return False
+                try:
+                    return self.argon2.verify(password_hash, password)
+                except (VerificationError, InvalidHashError):
+                    return False
+
             password_bytes = password.encode('utf-8')
             hash_bytes = password_hash.encode('utf-8')
             return bcrypt.checkpw(password_bytes, hash_bytes)
         except Exception:
             return False
+    
+    def dummy_verify(self, password: str) -> bool:
+        """
+        Spend the same time as a real verification when there is no hash to check,
+        so response timing does not reveal whether an account exists
+        Returns: always False
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash_password(secrets.token_urlsafe(16))
+        self.verify_password(password, self._dummy_hash)
+        return False
+    
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Check whether a stored hash should be upgraded to the current Argon2id parameters
+        Returns: True if the hash is bcrypt or uses outdated Argon2 parameters
+        """
+        if self.argon2 is None:
+            return False
+        if not password_hash.startswith('$argon2'):
+            return True
+        try:
+            return self.argon2.check_needs_rehash(password_hash)
+        except Exception:
+            return False
 
 # Global instance
 password_service = PasswordService()
@@ -6,7 +6,11 @@ Detects common patterns and indicators associated with fake news
 import re
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from collections import Counter
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 @dataclass
 class PatternResult:
@@ -128,14 +132,54 @@ class PatternDetector:
                 'description': 'Statistical data present'
             }
         }
+        
+        # Compile every regex once instead of going through re's pattern cache per call
+        self.excessive_caps_re = re.compile(self.emotional_patterns['excessive_caps']['pattern'])
+        self.multiple_exclamation_re = re.compile(self.emotional_patterns['multiple_exclamation']['pattern'])
+        self.poor_grammar_res = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in self.credibility_patterns['poor_grammar']['patterns']
+        ]
+        self.clickbait_numbers_re = re.compile(
+            self.credibility_patterns['clickbait_numbers']['pattern'], re.IGNORECASE
+        )
+        self.excessive_punctuation_re = re.compile(self.credibility_patterns['excessive_punctuation']['pattern'])
+        self.credibility_indicator_res = {
+            name: re.compile(data['pattern'], re.IGNORECASE)
+            for name, data in self.credibility_indicators.items()
+        }
+        
+        # Every substring-matched word/phrase list, found in one Aho-Corasick pass
+        # over the text when pyahocorasick is installed
+        self.matched_phrases = (
+            self.emotional_patterns['emotional_words']['words'] +
+            self.emotional_patterns['sensational_phrases']['phrases'] +
+            self.suspicious_patterns['vague_sources']['phrases'] +
+            self.suspicious_patterns['conspiracy_language']['phrases']
+        )
+        self.phrase_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for phrase in self.matched_phrases:
+                automaton.add_word(phrase, phrase)
+            automaton.make_automaton()
+            self.phrase_automaton = automaton
     
-    def detect_patterns(self, content: str, title: str = "") -> PatternResult:
+    def _find_phrases(self, text_lower: str) -> set:
+        """Words/phrases from the substring-matched lists that occur in the lowercased text"""
+        if self.phrase_automaton is not None:
+            return {phrase for _, phrase in self.phrase_automaton.iter(text_lower)}
+        return {phrase for phrase in self.matched_phrases if phrase in text_lower}
+    
+    def detect_patterns(self, content: str, title: str = "",
+                        content_lower: Optional[str] = None) -> PatternResult:
         """
         Detect fake news patterns in content
         
         Args:
             content: Article content to analyze
             title: Article title (optional)
+            content_lower: content.lower(), if the caller already has it
             
         Returns:
             PatternResult with detected patterns and scores
@@ -152,6 +196,12 @@ class PatternDetector:
         
         # Combine title and content for analysis
         full_text = f"{title} {content}".strip()
+        # Lowercased once and shared by the phrase scan and the suspicious-pattern checks
+        if content_lower is not None:
+            full_text_lower = f"{title.lower()} {content_lower}".strip()
+        else:
+            full_text_lower = full_text.lower()
+        found_phrases = self._find_phrases(full_text_lower)
         
         # Initialize results
         pattern_scores = {}
@@ -162,12 +212,12 @@ class PatternDetector:
         
         # Analyze emotional patterns
         emotional_score = self._analyze_emotional_patterns(
-            full_text, pattern_scores, emotional_indicators
+            full_text, found_phrases, pattern_scores, emotional_indicators
         )
         
         # Analyze suspicious patterns
         suspicious_score = self._analyze_suspicious_patterns(
-            full_text, pattern_scores, suspicious_phrases
+            full_text_lower, found_phrases, pattern_scores, suspicious_phrases
         )
         
         # Analyze credibility patterns
@@ -190,14 +240,13 @@ class PatternDetector:
             credibility_flags=credibility_flags
         )
     
-    def _analyze_emotional_patterns(self, text: str, pattern_scores: Dict, 
+    def _analyze_emotional_patterns(self, text: str, found_phrases: set, pattern_scores: Dict,
                                   emotional_indicators: List) -> float:
         """Analyze emotional language patterns"""
         total_score = 0.0
-        text_lower = text.lower()
         
         # Check excessive capitalization
-        caps_matches = re.findall(self.emotional_patterns['excessive_caps']['pattern'], text)
+        caps_matches = self.excessive_caps_re.findall(text)
         if caps_matches:
             score = min(len(caps_matches) * 0.1, self.emotional_patterns['excessive_caps']['weight'])
             total_score += score
@@ -205,7 +254,7 @@ class PatternDetector:
             emotional_indicators.extend(caps_matches[:3])  # Limit to first 3
         
         # Check multiple exclamation marks
-        excl_matches = re.findall(self.emotional_patterns['multiple_exclamation']['pattern'], text)
+        excl_matches = self.multiple_exclamation_re.findall(text)
         if excl_matches:
             score = min(len(excl_matches) * 0.05, self.emotional_patterns['multiple_exclamation']['weight'])
             total_score += score
@@ -214,7 +263,7 @@ class PatternDetector:
         
         # Check emotional words
         emotional_words = self.emotional_patterns['emotional_words']['words']
-        found_words = [word for word in emotional_words if word in text_lower]
+        found_words = [word for word in emotional_words if word in found_phrases]
         if found_words:
             score = min(len(found_words) * 0.05, self.emotional_patterns['emotional_words']['weight'])
             total_score += score
@@ -223,24 +272,23 @@ class PatternDetector:
         
         # Check sensational phrases
         sensational_phrases = self.emotional_patterns['sensational_phrases']['phrases']
-        found_phrases = [phrase for phrase in sensational_phrases if phrase in text_lower]
-        if found_phrases:
-            score = min(len(found_phrases) * 0.1, self.emotional_patterns['sensational_phrases']['weight'])
+        found_sensational = [phrase for phrase in sensational_phrases if phrase in found_phrases]
+        if found_sensational:
+            score = min(len(found_sensational) * 0.1, self.emotional_patterns['sensational_phrases']['weight'])
             total_score += score
             pattern_scores['Sensational phrases'] = score
-            emotional_indicators.extend(found_phrases[:3])
+            emotional_indicators.extend(found_sensational[:3])
         
         return total_score
     
-    def _analyze_suspicious_patterns(self, text: str, pattern_scores: Dict,
+    def _analyze_suspicious_patterns(self, text_lower: str, found_phrases: set, pattern_scores: Dict,
                                    suspicious_phrases: List) -> float:
-        """Analyze suspicious content patterns"""
+        """Analyze suspicious content patterns (text_lower: the already-lowercased text)"""
         total_score = 0.0
-        text_lower = text.lower()
         
         # Check vague sources
         vague_phrases = self.suspicious_patterns['vague_sources']['phrases']
-        found_vague = [phrase for phrase in vague_phrases if phrase in text_lower]
+        found_vague = [phrase for phrase in vague_phrases if phrase in found_phrases]
         if found_vague:
             score = min(len(found_vague) * 0.05, self.suspicious_patterns['vague_sources']['weight'])
             total_score += score
@@ -249,7 +297,8 @@ class PatternDetector:
         
         # Check absolute statements
         absolute_words = self.suspicious_patterns['absolute_statements']['words']
-        found_absolute = [word for word in absolute_words if f' {word} ' in f' {text_lower} ']
+        padded_text = f' {text_lower} '
+        found_absolute = [word for word in absolute_words if f' {word} ' in padded_text]
         if found_absolute:
             score = min(len(found_absolute) * 0.02, self.suspicious_patterns['absolute_statements']['weight'])
             total_score += score
@@ -258,7 +307,7 @@ class PatternDetector:
         
         # Check conspiracy language
         conspiracy_phrases = self.suspicious_patterns['conspiracy_language']['phrases']
-        found_conspiracy = [phrase for phrase in conspiracy_phrases if phrase in text_lower]
+        found_conspiracy = [phrase for phrase in conspiracy_phrases if phrase in found_phrases]
         if found_conspiracy:
             score = min(len(found_conspiracy) * 0.08, self.suspicious_patterns['conspiracy_language']['weight'])
             total_score += score
@@ -274,8 +323,8 @@ class PatternDetector:
         
         # Check poor grammar patterns
         grammar_issues = 0
-        for pattern in self.credibility_patterns['poor_grammar']['patterns']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in self.poor_grammar_res:
+            matches = pattern.findall(text)
             grammar_issues += len(matches)
         
         if grammar_issues > 0:
@@ -285,7 +334,7 @@ class PatternDetector:
             credibility_flags.append(f"Grammar issues: {grammar_issues}")
         
         # Check clickbait numbers
-        clickbait_matches = re.findall(self.credibility_patterns['clickbait_numbers']['pattern'], text, re.IGNORECASE)
+        clickbait_matches = self.clickbait_numbers_re.findall(text)
         if clickbait_matches:
             score = min(len(clickbait_matches) * 0.1, self.credibility_patterns['clickbait_numbers']['weight'])
             total_score += score
@@ -293,7 +342,7 @@ class PatternDetector:
             credibility_flags.extend(clickbait_matches[:3])
         
         # Check excessive punctuation
-        punct_matches = re.findall(self.credibility_patterns['excessive_punctuation']['pattern'], text)
+        punct_matches = self.excessive_punctuation_re.findall(text)
         if punct_matches:
             score = min(len(punct_matches) * 0.05, self.credibility_patterns['excessive_punctuation']['weight'])
             total_score += score
@@ -302,7 +351,7 @@ class PatternDetector:
         
         # Check positive credibility indicators (these reduce the fake news score)
         for indicator_name, indicator_data in self.credibility_indicators.items():
-            matches = re.findall(indicator_data['pattern'], text, re.IGNORECASE)
+            matches = self.credibility_indicator_res[indicator_name].findall(text)
             if matches:
                 score = max(len(matches) * 0.02, indicator_data['weight'])  # Negative weight
                 total_score += score
@@ -5,15 +5,22 @@ Semantic Re-ranking, Grounded Reasoning, and full observability.
 """
 
 import uuid, time, re, logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
 from groq import Groq
+from config import Config
 from services.extractor import ArticleContent
 from services.news_fetcher import NewsFetcher
 from services.similarity import SimilarityEngine, SimilarityScore
 from services.keyword_extractor import KeywordExtractor
+from services.trusted_sources import CORE_TRUSTED_SOURCES, compile_source_pattern
+
+# Writes RAG log/metrics rows off the request thread; a single writer bounds the
+# background threads and keeps SQLite to one concurrent writer
+_db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rag-db-writer')
 
 
 # ---------------------------------------------------------------------------
@@ -91,6 +98,8 @@ class RAGPipelineResult:
     processing_time: float
     metrics: PipelineMetrics
     step_logs: List[StepMetrics] = field(default_factory=list)
+    # No evidence retrieved, or the LLM reasoning fell back (e.g. Groq/NewsAPI outage)
+    degraded: bool = False
 
 # ---------------------------------------------------------------------------
 # RAGPipeline
@@ -113,22 +122,27 @@ class RAGPipeline:
     12. JSON Output
     """
 
-    TRUSTED_SOURCES = {
-        'bbc', 'reuters', 'associated press', 'cnn', 'npr',
-        'the guardian', 'new york times', 'washington post',
-        'wall street journal', 'bloomberg', 'the hindu', 'ndtv',
-        'times of india', 'indian express', 'hindustan times',
+    TRUSTED_SOURCES = CORE_TRUSTED_SOURCES | {
         'al jazeera', 'france 24', 'dw', 'pbs', 'abc news',
-        'cbs news', 'nbc news', 'financial times', 'india today',
-        'news18', 'firstpost', 'the quint', 'scroll', 'the print',
-        'mint', 'livemint', 'moneycontrol', 'economic times',
-        'deccan herald', 'telegraph india', 'tribune india',
+        'cbs news', 'nbc news', 'financial times',
+        'telegraph india', 'tribune india',
     }
+    TRUSTED_SOURCE_PATTERN = compile_source_pattern(TRUSTED_SOURCES)
+
+    SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+    SLUG_SEPARATOR_PATTERN = re.compile(r'[/_\-]+')
+    SLUG_NUMBER_PATTERN = re.compile(r'\d{4,}')
+
+    # Ignored when measuring claim/document keyword overlap
+    OVERLAP_STOP_WORDS = frozenset({
+        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+        "of", "is", "was", "are", "were", "be", "been", "that", "this",
+    })
 
     def __init__(self, groq_api_key: str, news_api_key: str, serpapi_key: str = None):
         self.logger = logging.getLogger('fake_news_detector.rag_pipeline')
         self.groq_client = Groq(api_key=groq_api_key) if groq_api_key else None
-        self.similarity_engine = SimilarityEngine()
+        self.similarity_engine = SimilarityEngine(model_name=Config.EMBEDDING_MODEL)
 
         self.news_fetcher = None
         if news_api_key:
@@ -149,6 +163,9 @@ class RAGPipeline:
         self.rerank_top  = 5
         self.min_results_threshold = 3   # trigger RAG fallback below this
 
+        # Knowledge-base searches run here, concurrently with news retrieval
+        self._rag_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='rag-search')
+
     # -----------------------------------------------------------------------
     # Public entry point
     # -----------------------------------------------------------------------
@@ -164,6 +181,10 @@ class RAGPipeline:
             # STEP 2: Query Expansion
             expanded_queries = self._step2_query_expansion(request_id, claim_entity, step_logs)
 
+            # The STEP 4 vector search only needs the input article, so it
+            # runs while STEP 3 waits on the news APIs
+            rag_search = self._start_rag_search(article)
+
             # STEP 3: Multi-Source Retrieval (broad, no domain filter)
             t_news = time.time()
             news_articles, used_sources = self._step3_retrieval(
@@ -172,11 +193,9 @@ class RAGPipeline:
             news_ms = (time.time() - t_news) * 1000
 
             # STEP 4: RAG Fallback
-            t_rag = time.time()
-            rag_scores = self._step4_rag_fallback(
-                request_id, article, news_articles, step_logs
+            rag_scores, rag_ms = self._step4_rag_fallback(
+                request_id, rag_search, news_articles, step_logs
             )
-            rag_ms = (time.time() - t_rag) * 1000
             if "rag" not in used_sources and rag_scores:
                 used_sources.append("rag")
 
@@ -213,7 +232,7 @@ class RAGPipeline:
 
             # STEP 9: Grounded Reasoning
             r_start = time.time()
-            reasoning = self._step9_grounded_reasoning(
+            reasoning, reasoning_fallback = self._step9_grounded_reasoning(
                 request_id, claim_entity, evidence, gap, step_logs
             )
             llm_ms += (time.time() - r_start) * 1000
@@ -266,6 +285,7 @@ class RAGPipeline:
                 processing_time=total_ms / 1000,
                 metrics=metrics,
                 step_logs=step_logs,
+                degraded=reasoning_fallback or not (evidence["news_api"] or evidence["rag"]),
             )
             self.logger.info(f"[{request_id}] Pipeline complete in {total_ms:.0f}ms")
             return result
@@ -328,7 +348,7 @@ class RAGPipeline:
         title   = (article.title   or "").strip()
         content = (article.content or "").strip()
         if len(content) >= 200:
-            sentences = re.split(r'(?<=[.!?])\s+', content)
+            sentences = self.SENTENCE_BOUNDARY_PATTERN.split(content)
             for sent in sentences:
                 sent = sent.strip()
                 if len(sent) > 40:
@@ -348,8 +368,8 @@ class RAGPipeline:
         if url:
             from urllib.parse import urlparse
             path = urlparse(url).path
-            slug = re.sub(r'[/_\-]+', ' ', path).strip()
-            slug = re.sub(r'\d{4,}', '', slug).strip()
+            slug = self.SLUG_SEPARATOR_PATTERN.sub(' ', path).strip()
+            slug = self.SLUG_NUMBER_PATTERN.sub('', slug).strip()
             if len(slug) > 10:
                 slug_keywords = f" URL context: {slug[:150]}"
         if not self.groq_client:
@@ -569,14 +589,38 @@ Queries:"""
     # STEP 4: RAG Fallback
     # -----------------------------------------------------------------------
 
-    def _step4_rag_fallback(self, request_id: str, article: ArticleContent,
+    def _start_rag_search(self, article: ArticleContent) -> Future:
+        """
+        Begin the Vector DB search for STEP 4 on a worker thread.
+        Resolves to (scores, latency_ms).
+        """
+        from flask import current_app, has_app_context
+        app = current_app._get_current_object() if has_app_context() else None
+        # Widest top_k STEP 4 can use (when news retrieval is weak)
+        top_k = max(self.top_k_rag, min(10, self.top_k_rag * 2))
+
+        def search():
+            t0 = time.time()
+            if app is not None:
+                # Worker thread: the session is scoped to this app context
+                with app.app_context():
+                    scores = self.similarity_engine.search_knowledge_base(article, top_k=top_k)
+            else:
+                scores = self.similarity_engine.search_knowledge_base(article, top_k=top_k)
+            return scores, (time.time() - t0) * 1000
+
+        return self._rag_executor.submit(search)
+
+    def _step4_rag_fallback(self, request_id: str, rag_search: Future,
                              news_articles: List[ArticleContent],
-                             step_logs: list) -> List[SimilarityScore]:
+                             step_logs: list) -> tuple:
         """
         Always query Vector DB.
         If news retrieval is weak (< threshold), increase top_k.
+        The search (started before STEP 3) fetched the widest top_k; results
+        come back nearest first, so trimming them equals a smaller top_k query.
+        Returns: (scores, search latency in ms)
         """
-        t0 = time.time()
         top_k = self.top_k_rag
         if len(news_articles) < self.min_results_threshold:
             top_k = min(10, top_k * 2)  # Double the RAG results when news is weak
@@ -586,12 +630,12 @@ Queries:"""
             )
 
         try:
-            scores = self.similarity_engine.search_knowledge_base(article, top_k=top_k)
+            scores, ms = rag_search.result()
+            scores = scores[:top_k]
         except Exception as e:
             self.logger.warning(f"[{request_id}] RAG fallback failed: {e}")
-            scores = []
+            scores, ms = [], 0.0
 
-        ms = (time.time() - t0) * 1000
         self._log_step(step_logs, "step4_rag_fallback", ms, {
             "rag_results": len(scores),
             "top_k_used": top_k,
@@ -600,7 +644,7 @@ Queries:"""
         self.logger.info(
             f"[{request_id}] STEP 4 – RAG returned {len(scores)} docs in {ms:.0f}ms"
         )
-        return scores
+        return scores, ms
 
     # -----------------------------------------------------------------------
     # STEP 5: Hybrid Merging
@@ -638,18 +682,19 @@ Queries:"""
 
     def _step6_rerank(self, merged: List[Dict], claim_entity: ClaimEntity,
                       article: ArticleContent) -> List[Dict]:
-        for doc in merged:
-            sim = doc["similarity"]
-            if sim == 0.0 and doc["content"]:
-                doc_art = ArticleContent(
-                    title=doc["title"], content=doc["content"],
-                    url=doc["url"], source=doc["source"]
-                )
-                sim = self._cosine_sim(article, doc_art)
+        # Embed the article and every unscored document in one encoder batch
+        unscored = [d for d in merged if d["similarity"] == 0.0 and d["content"]]
+        if unscored:
+            for doc, sim in zip(unscored, self._cosine_sims(article, unscored)):
                 doc["similarity"] = sim
 
+        # Tokenize the claim once for every document scored below
+        claim_words = set(claim_entity.normalized_claim.lower().split()) - self.OVERLAP_STOP_WORDS
+
+        for doc in merged:
+            sim = doc["similarity"]
             kw_score   = self._keyword_overlap(
-                claim_entity.normalized_claim,
+                claim_words,
                 doc["title"] + " " + doc["content"]
             )
             cred_score = 0.25 if doc["is_trusted"] else 0.0
@@ -660,22 +705,22 @@ Queries:"""
         merged.sort(key=lambda d: d["_rank_score"], reverse=True)
         return merged[:self.rerank_top]
 
-    def _cosine_sim(self, a1: ArticleContent, a2: ArticleContent) -> float:
+    def _cosine_sims(self, article: ArticleContent, docs: List[Dict]) -> List[float]:
         try:
-            e1 = self.similarity_engine.generate_embedding(f"{a1.title} {a1.content}")
-            e2 = self.similarity_engine.generate_embedding(f"{a2.title} {a2.content}")
-            return float(self.similarity_engine._cosine_similarity(e1, e2))
+            texts = [f"{article.title} {article.content}"]
+            texts.extend(f"{d['title']} {d['content']}" for d in docs)
+            target, *embeddings = self.similarity_engine.generate_embeddings(texts)
+            sims = self.similarity_engine._cosine_similarities(target, embeddings)
+            return [float(sim) for sim in sims]
         except Exception:
-            return 0.0
+            return [0.0] * len(docs)
 
-    def _keyword_overlap(self, claim: str, doc_text: str) -> float:
-        stop = {"the","a","an","and","or","but","in","on","at","to","for",
-                "of","is","was","are","were","be","been","that","this"}
-        cw = set(claim.lower().split()) - stop
-        dw = set(doc_text.lower().split()) - stop
-        if not cw:
+    def _keyword_overlap(self, claim_words: set, doc_text: str) -> float:
+        if not claim_words:
             return 0.0
-        return len(cw & dw) / len(cw)
+        # Probe the document's tokens against the (stop-word free) claim set rather
+        # than building a set of every document word
+        return len(claim_words.intersection(doc_text.lower().split())) / len(claim_words)
 
     # -----------------------------------------------------------------------
     # STEP 7: Evidence Analysis
@@ -766,10 +811,11 @@ Queries:"""
     # -----------------------------------------------------------------------
 
     def _step9_grounded_reasoning(self, request_id: str, claim_entity: ClaimEntity,
-                                   evidence: Dict, gap: str, step_logs: list) -> str:
+                                   evidence: Dict, gap: str, step_logs: list) -> tuple:
+        """(reasoning, fell_back): fell_back is True when the LLM was unavailable"""
         t0 = time.time()
         if not self.groq_client:
-            return f"Evidence analysis: {gap}"
+            return f"Evidence analysis: {gap}", True
 
         ev_lines = []
         for ev in evidence["news_api"][:3]:
@@ -797,20 +843,23 @@ Queries:"""
                 temperature=0.2, max_tokens=200,
             )
             reasoning = resp.choices[0].message.content.strip()
+            fell_back = False
         except Exception as e:
             self.logger.warning(f"[{request_id}] LLM reasoning failed: {e}")
             reasoning = f"Based on {sources_used} sources, the evidence indicates: {gap}."
+            fell_back = True
 
         ms = (time.time() - t0) * 1000
         self._log_step(step_logs, "step9_grounded_reasoning", ms, {
             "reasoning_length": len(reasoning),
             "sources_used": sources_used,
+            "llm_fallback": fell_back,
         })
         self.logger.info(
             f"[{request_id}] STEP 9 – reasoning_len={len(reasoning)} "
             f"sources_used={sources_used}"
         )
-        return reasoning
+        return reasoning, fell_back
 
     # -----------------------------------------------------------------------
     # STEP 10: Confidence Scoring
@@ -912,7 +961,6 @@ Queries:"""
                       gap: str, metrics: PipelineMetrics):
         try:
             from models.rag_analysis_log import RAGAnalysisLog, RAGMetrics
-            from models.user import db
             sd = evidence["stance_dist"]
             log = RAGAnalysisLog(
                 request_id=request_id,
@@ -926,7 +974,6 @@ Queries:"""
                 contradict_count=sd["contradict"],
                 gap_type=gap,
             )
-            db.session.add(log)
             met = RAGMetrics(
                 request_id=request_id,
                 retrieval_accuracy=metrics.retrieval_accuracy,
@@ -934,13 +981,34 @@ Queries:"""
                 confidence_score=metrics.confidence_score,
                 evidence_coverage=metrics.evidence_coverage,
             )
-            db.session.add(met)
+        except Exception as e:
+            self.logger.warning(f"[{request_id}] DB storage failed: {e}")
+            return
+
+        # Observability rows are not needed by the response, so inside a
+        # Flask request they are written off the request thread
+        from flask import current_app, has_app_context
+        if has_app_context():
+            _db_writer.submit(
+                self._write_rows, request_id, [log, met], current_app._get_current_object()
+            )
+        else:
+            self._write_rows(request_id, [log, met])
+
+    def _write_rows(self, request_id: str, rows: list, app=None):
+        if app is not None:
+            # Background thread: the session is scoped to this app context
+            with app.app_context():
+                self._write_rows(request_id, rows)
+            return
+        from models.user import db
+        try:
+            db.session.add_all(rows)
             db.session.commit()
             self.logger.info(f"[{request_id}] DB stored")
         except Exception as e:
             self.logger.warning(f"[{request_id}] DB storage failed: {e}")
             try:
-                from models.user import db
                 db.session.rollback()
             except Exception:
                 pass
@@ -950,8 +1018,7 @@ Queries:"""
     # -----------------------------------------------------------------------
 
     def _is_trusted(self, source: str) -> bool:
-        sl = source.lower()
-        return any(t in sl for t in self.TRUSTED_SOURCES)
+        return self.TRUSTED_SOURCE_PATTERN.search(source.lower()) is not None
 
     def _build_explanation(self, verdict: str, confidence: float,
                             evidence: Dict, reasoning: str) -> str:
@@ -6,16 +6,26 @@ import time
 import threading
 from typing import Dict, Optional, Tuple
 from collections import defaultdict, deque
-from datetime import datetime, timedelta
+
+class _RateLimitShard:
+    """Request history for the client IPs that hash to one lock"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(deque)  # IP -> deque of request timestamps
+        self.blocked_ips = {}  # IP -> block_until_timestamp
+        self.violations = defaultdict(int)  # IP -> violation count
+        self.last_cleanup = time.time()
 
 class RateLimiter:
     """Rate limiting service to prevent abuse and DoS attacks"""
     
+    # Independent lock + state partitions, so requests from different IPs don't contend
+    SHARD_COUNT = 16
+    
     def __init__(self):
         """Initialize rate limiter with default limits"""
-        self.requests = defaultdict(deque)  # IP -> deque of request timestamps
-        self.blocked_ips = {}  # IP -> block_until_timestamp
-        self.lock = threading.Lock()
+        self.shards = [_RateLimitShard() for _ in range(self.SHARD_COUNT)]
         
         # Rate limiting configuration
         self.limits = {
@@ -27,12 +37,22 @@ class RateLimiter:
             'max_violations': 3             # Block after 3 violations
         }
         
-        # Violation tracking
-        self.violations = defaultdict(int)  # IP -> violation count
-        
-        # Cleanup thread
+        # Cleanup interval (per shard)
         self.cleanup_interval = 300  # 5 minutes
-        self.last_cleanup = time.time()
+    
+    def _shard(self, client_ip: str) -> _RateLimitShard:
+        """Shard holding the state for a client IP"""
+        return self.shards[hash(client_ip) % self.SHARD_COUNT]
+    
+    @staticmethod
+    def _count_since(request_times: deque, cutoff: float) -> int:
+        """Requests newer than cutoff, walking back from the newest (timestamps are in order)"""
+        count = 0
+        for req_time in reversed(request_times):
+            if req_time <= cutoff:
+                break
+            count += 1
+        return count
     
     def is_allowed(self, client_ip: str) -> Tuple[bool, Dict[str, any]]:
         """
@@ -41,18 +61,19 @@ class RateLimiter:
         Returns:
             Tuple of (allowed: bool, info: dict)
         """
-        with self.lock:
+        shard = self._shard(client_ip)
+        with shard.lock:
             current_time = time.time()
             
             # Cleanup old data periodically
-            if current_time - self.last_cleanup > self.cleanup_interval:
-                self._cleanup_old_data(current_time)
-                self.last_cleanup = current_time
+            if current_time - shard.last_cleanup > self.cleanup_interval:
+                self._cleanup_old_data(shard, current_time)
+                shard.last_cleanup = current_time
             
             # Check if IP is currently blocked
-            if client_ip in self.blocked_ips:
-                if current_time < self.blocked_ips[client_ip]:
-                    remaining_time = int(self.blocked_ips[client_ip] - current_time)
+            if client_ip in shard.blocked_ips:
+                if current_time < shard.blocked_ips[client_ip]:
+                    remaining_time = int(shard.blocked_ips[client_ip] - current_time)
                     return False, {
                         'reason': 'ip_blocked',
                         'message': f'IP blocked for {remaining_time} seconds due to rate limit violations',
@@ -60,17 +81,21 @@ class RateLimiter:
                     }
                 else:
                     # Block expired, remove it
-                    del self.blocked_ips[client_ip]
+                    del shard.blocked_ips[client_ip]
             
-            # Get request history for this IP
-            request_times = self.requests[client_ip]
+            # Get request history for this IP, dropping entries older than the
+            # longest window so the hour count is just the deque length
+            request_times = shard.requests[client_ip]
+            hour_cutoff = current_time - 3600
+            while request_times and request_times[0] <= hour_cutoff:
+                request_times.popleft()
             
             # Check burst limit (requests in last burst_window seconds)
             burst_cutoff = current_time - self.limits['burst_window']
-            burst_requests = sum(1 for req_time in request_times if req_time > burst_cutoff)
+            burst_requests = self._count_since(request_times, burst_cutoff)
             
             if burst_requests >= self.limits['burst_limit']:
-                self._handle_violation(client_ip, current_time, 'burst_limit')
+                self._handle_violation(shard, client_ip, current_time, 'burst_limit')
                 return False, {
                     'reason': 'burst_limit_exceeded',
                     'message': f'Too many requests in {self.limits["burst_window"]} seconds',
@@ -79,10 +104,10 @@ class RateLimiter:
             
             # Check per-minute limit
             minute_cutoff = current_time - 60
-            minute_requests = sum(1 for req_time in request_times if req_time > minute_cutoff)
+            minute_requests = self._count_since(request_times, minute_cutoff)
             
             if minute_requests >= self.limits['requests_per_minute']:
-                self._handle_violation(client_ip, current_time, 'minute_limit')
+                self._handle_violation(shard, client_ip, current_time, 'minute_limit')
                 return False, {
                     'reason': 'minute_limit_exceeded',
                     'message': f'Too many requests per minute',
@@ -90,11 +115,10 @@ class RateLimiter:
                 }
             
             # Check per-hour limit
-            hour_cutoff = current_time - 3600
-            hour_requests = sum(1 for req_time in request_times if req_time > hour_cutoff)
+            hour_requests = len(request_times)
             
             if hour_requests >= self.limits['requests_per_hour']:
-                self._handle_violation(client_ip, current_time, 'hour_limit')
+                self._handle_violation(shard, client_ip, current_time, 'hour_limit')
                 return False, {
                     'reason': 'hour_limit_exceeded',
                     'message': f'Too many requests per hour',
@@ -114,25 +138,26 @@ class RateLimiter:
             
             return True, remaining_info
     
-    def _handle_violation(self, client_ip: str, current_time: float, violation_type: str):
+    def _handle_violation(self, shard: _RateLimitShard, client_ip: str, current_time: float,
+                          violation_type: str):
         """Handle rate limit violation"""
-        self.violations[client_ip] += 1
+        shard.violations[client_ip] += 1
         
         # Block IP if too many violations
-        if self.violations[client_ip] >= self.limits['max_violations']:
+        if shard.violations[client_ip] >= self.limits['max_violations']:
             block_until = current_time + self.limits['block_duration']
-            self.blocked_ips[client_ip] = block_until
+            shard.blocked_ips[client_ip] = block_until
             
             # Reset violation count after blocking
-            self.violations[client_ip] = 0
+            shard.violations[client_ip] = 0
     
-    def _cleanup_old_data(self, current_time: float):
-        """Clean up old request data to prevent memory buildup"""
+    def _cleanup_old_data(self, shard: _RateLimitShard, current_time: float):
+        """Clean up a shard's old request data to prevent memory buildup"""
         hour_cutoff = current_time - 3600
         
         # Clean up request histories
-        for ip in list(self.requests.keys()):
-            request_times = self.requests[ip]
+        for ip in list(shard.requests.keys()):
+            request_times = shard.requests[ip]
             
             # Remove old requests
             while request_times and request_times[0] < hour_cutoff:
@@ -140,33 +165,34 @@ class RateLimiter:
             
             # Remove empty entries
             if not request_times:
-                del self.requests[ip]
+                del shard.requests[ip]
         
         # Clean up expired blocks
-        for ip in list(self.blocked_ips.keys()):
-            if current_time >= self.blocked_ips[ip]:
-                del self.blocked_ips[ip]
+        for ip in list(shard.blocked_ips.keys()):
+            if current_time >= shard.blocked_ips[ip]:
+                del shard.blocked_ips[ip]
         
         # Clean up old violations (reset after 24 hours)
         violation_cutoff = current_time - 86400  # 24 hours
-        for ip in list(self.violations.keys()):
+        for ip in list(shard.violations.keys()):
             # This is a simple approach - in production, you'd want more sophisticated violation tracking
-            if len(self.requests.get(ip, [])) == 0:
+            if len(shard.requests.get(ip, [])) == 0:
                 # No recent requests, reset violations
-                del self.violations[ip]
+                del shard.violations[ip]
     
     def get_rate_limit_headers(self, client_ip: str) -> Dict[str, str]:
         """Get rate limit headers for response"""
-        with self.lock:
+        shard = self._shard(client_ip)
+        with shard.lock:
             current_time = time.time()
-            request_times = self.requests.get(client_ip, deque())
+            request_times = shard.requests.get(client_ip, deque())
             
             # Calculate current usage
             minute_cutoff = current_time - 60
             hour_cutoff = current_time - 3600
             
-            minute_requests = sum(1 for req_time in request_times if req_time > minute_cutoff)
-            hour_requests = sum(1 for req_time in request_times if req_time > hour_cutoff)
+            minute_requests = self._count_since(request_times, minute_cutoff)
+            hour_requests = self._count_since(request_times, hour_cutoff)
             
             return {
                 'X-RateLimit-Limit-Minute': str(self.limits['requests_per_minute']),
@@ -179,13 +205,18 @@ class RateLimiter:
     
     def get_stats(self) -> Dict[str, any]:
         """Get rate limiter statistics"""
-        with self.lock:
-            return {
-                'active_ips': len(self.requests),
-                'blocked_ips': len(self.blocked_ips),
-                'total_violations': sum(self.violations.values()),
-                'limits': self.limits.copy()
-            }
+        active_ips = blocked_ips = total_violations = 0
+        for shard in self.shards:
+            with shard.lock:
+                active_ips += len(shard.requests)
+                blocked_ips += len(shard.blocked_ips)
+                total_violations += sum(shard.violations.values())
+        return {
+            'active_ips': active_ips,
+            'blocked_ips': blocked_ips,
+            'total_violations': total_violations,
+            'limits': self.limits.copy()
+        }
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
\ No newline at end of file
@@ -3,6 +3,7 @@ Security validation and sanitization service
 """
 
 import re
+import sys
 import html
 import urllib.parse
 from typing import Dict, Any, Optional, List
@@ -63,6 +64,12 @@ class SecurityValidator:
         # Compile patterns for performance
         self.sql_patterns_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.sql_injection_patterns]
         self.xss_patterns_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.xss_patterns]
+        
+        # Domain names: letters, numbers, hyphens, and dots
+        self.domain_pattern = re.compile(
+            r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
+        )
+        self.ip_address_pattern = re.compile(r'\d+\.\d+\.\d+\.\d+')
     
     def validate_url(self, url: str) -> Dict[str, Any]:
         """
@@ -228,12 +235,7 @@ class SecurityValidator:
         if not domain or len(domain) > 253:
             return False
         
-        # Domain pattern: allows letters, numbers, hyphens, and dots
-        domain_pattern = re.compile(
-            r'^[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*$'
-        )
-        
-        return bool(domain_pattern.match(domain))
+        return bool(self.domain_pattern.match(domain))
     
     def _is_private_ip(self, domain: str) -> bool:
         """Check if domain is a private/local IP address"""
@@ -269,7 +271,7 @@ class SecurityValidator:
             warnings.append("URL shortener detected - verify destination")
         
         # Check for suspicious patterns
-        if re.search(r'\d+\.\d+\.\d+\.\d+', url):
+        if self.ip_address_pattern.search(url):
             warnings.append("IP address in URL - verify legitimacy")
         
         if len(parsed.path) > 100:
@@ -297,6 +299,24 @@ class SecurityValidator:
             'Content-Security-Policy': "default-src 'self'",
             'Referrer-Policy': 'strict-origin-when-cross-origin'
         }
+    
+    def apply_security_headers(self, response, overwrite: bool = True):
+        """Set the security headers on a response (existing values are kept unless overwrite)"""
+        for header, value in self.get_security_headers().items():
+            if overwrite or header not in response.headers:
+                response.headers[header] = value
+        return response
+    
+    def get_client_ip(self, request) -> Optional[str]:
+        """
+        Client IP for a request: the socket peer address. X-Forwarded-For is
+        client-controlled, so it is only honoured through ProxyFix, which create_app()
+        installs when TRUSTED_PROXY_COUNT says the app runs behind proxies
+        """
+        client_ip = request.remote_addr
+        # Interned so the rate limiter's per-IP dicts share one key object per client
+        # and repeat lookups hit the identity fast path
+        return sys.intern(client_ip) if client_ip else client_ip
 
 # Global security validator instance
 security_validator = SecurityValidator()
\ No newline at end of file
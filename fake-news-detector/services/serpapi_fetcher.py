@@ -3,11 +3,12 @@ SerpAPI Google News fetcher for comprehensive news coverage
 """
 
 from typing import List, Dict
+import logging
 import requests
-import time
-import re
 from services.extractor import ArticleContent
 
+logger = logging.getLogger('fake_news_detector.serpapi')
+
 class SerpAPIFetcher:
     """Service for fetching news articles from Google News via SerpAPI"""
     
@@ -17,6 +18,10 @@ class SerpAPIFetcher:
         self.api_key = api_key
         self.limit = min(limit, 20)
         self.base_url = "https://serpapi.com/search"
+        # Keep-alive session so consecutive searches reuse the TLS connection
+        self.session = requests.Session()
+        # (connect, read): fail fast when SerpAPI is unreachable, allow slow responses
+        self.request_timeout = (3.05, 15)
     
     def fetch_google_news(self, query: str, keywords: List[str] = None) -> List[ArticleContent]:
         """
@@ -43,7 +48,7 @@ class SerpAPIFetcher:
                 'hl': 'en'   # Language
             }
             
-            response = requests.get(self.base_url, params=params, timeout=15)
+            response = self.session.get(self.base_url, params=params, timeout=self.request_timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -57,11 +62,11 @@ class SerpAPIFetcher:
                 if article:
                     articles.append(article)
             
-            print(f"SerpAPI: Found {len(articles)} articles")
+            logger.info("SerpAPI: Found %d articles", len(articles))
             return articles
             
         except Exception as e:
-            print(f"SerpAPI fetch failed: {str(e)}")
+            logger.warning("SerpAPI fetch failed: %s", e)
             return []
     
     def _build_search_query(self, query: str, keywords: List[str] = None) -> str:
@@ -71,7 +76,7 @@ class SerpAPIFetcher:
         supplemented by top keywords.
         """
         # Clean the query — remove filler but keep proper nouns and key terms
-        clean = re.sub(r'\s+', ' ', query).strip()
+        clean = ' '.join(query.split())
 
         # If we have a rich query (sentence), extract the most important words
         words = clean.split()
@@ -143,5 +148,5 @@ class SerpAPIFetcher:
                 published_date=date,
             )
         except Exception as e:
-            print(f"Error converting SerpAPI item: {e}")
+            logger.debug("Error converting SerpAPI item: %s", e)
             return None
@@ -2,11 +2,89 @@
 Semantic similarity engine using sentence transformers
 """
 
-from typing import List, Dict
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, TYPE_CHECKING
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from dataclasses import dataclass
+from config import Config
 from services.extractor import ArticleContent
+from services.trusted_sources import CORE_TRUSTED_SOURCES, compile_source_pattern
+
+logger = logging.getLogger('fake_news_detector.similarity')
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Loaded sentence transformer models shared by every SimilarityEngine in the process
+_shared_models: Dict[str, 'SentenceTransformer'] = {}
+_shared_models_lock = threading.Lock()
+
+def _inference_workers() -> int:
+    """
+    Concurrent encodes that fill the CPU without oversubscribing it: one when torch
+    uses every core for a forward pass (its default), otherwise cores / torch threads
+    (e.g. one per core when the Docker image sets OMP_NUM_THREADS=1)
+    """
+    try:
+        torch_threads = int(os.environ.get('OMP_NUM_THREADS', '0'))
+    except ValueError:
+        torch_threads = 0
+    if torch_threads <= 0:
+        return 1
+    return max(1, (os.cpu_count() or 1) // torch_threads)
+
+
+# Encodes run on these threads rather than on request threads, so concurrent
+# requests queue instead of running more forward passes than there are cores
+_inference_executor = ThreadPoolExecutor(
+    max_workers=_inference_workers(), thread_name_prefix='embedding'
+)
+
+
+# Substrings of source names treated as trusted news organizations
+TRUSTED_SOURCES = CORE_TRUSTED_SOURCES | {
+    'telegraph', 'tribune',
+    # US broadcasters, trusted by the RAG pipeline and the decision engine's input-source check
+    'pbs', 'abc news', 'cbs news', 'nbc news'
+}
+TRUSTED_SOURCE_PATTERN = compile_source_pattern(TRUSTED_SOURCES)
+
+
+def _get_shared_model(model_name: str) -> 'SentenceTransformer':
+    """Load a sentence transformer once per process and hand out the same instance"""
+    model = _shared_models.get(model_name)
+    if model is None:
+        with _shared_models_lock:
+            model = _shared_models.get(model_name)
+            if model is None:
+                # Imported here: sentence_transformers pulls in torch/transformers,
+                # which would otherwise dominate app import time
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(model_name)
+                if Config.EMBEDDING_INT8:
+                    import torch
+                    # int8 Linear weights: a quarter of the bytes streamed per matmul,
+                    # and the CPU's int8 dot-product instructions where available
+                    torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                    )
+                _shared_models[model_name] = model
+    return model
+
+
+def preload_model(model_name: str) -> None:
+    """Load a model eagerly (e.g. before server workers fork) so later engines reuse it"""
+    model = _get_shared_model(model_name)
+    # One throwaway encode initializes the tokenizer and inference kernels now,
+    # instead of on the first analysis request
+    model.encode(["warmup"], convert_to_tensor=False)
+
+
 @dataclass
 class SimilarityScore:
     article_url: str
@@ -18,38 +96,80 @@ class SimilarityScore:
 class SimilarityEngine:
     """Service for computing semantic similarity between articles"""
     
+    # Upper bound on cached embeddings (384 floats each) kept per process
+    EMBEDDING_CACHE_SIZE = 2048
+    # Longest wait for a queued/running encode (the analysis routes give the whole
+    # similarity step 15 seconds); an encode still queued by then is cancelled
+    ENCODE_TIMEOUT = 15  # seconds
+    
     def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
         self.model_name = model_name
         self.model = None
-        self.embedding_cache = {}
-        self.trusted_sources = {
-            'bbc', 'reuters', 'the hindu', 'ndtv', 'cnn', 'associated press',
-            'npr', 'pbs', 'the guardian', 'washington post', 'new york times',
-            'wall street journal', 'abc news', 'cbs news', 'nbc news'
-        }
+        self.embedding_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def _load_model(self):
         """Lazy load the sentence transformer model"""
         if self.model is None:
-            self.model = SentenceTransformer(self.model_name)
+            self.model = _get_shared_model(self.model_name)
+    
+    def _embedding_cache_key(self, text: str) -> str:
+        """Digest of the full text so long inputs sharing a prefix don't collide"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
     
     def generate_embedding(self, text: str) -> np.ndarray:
-        """Generate text embedding with caching"""
-        # Use first 500 characters as cache key to avoid memory issues
-        cache_key = text[:500]
+        """Generate text embedding with LRU caching for repeated inputs"""
+        return self.generate_embeddings([text])[0]
+    
+    def generate_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for several texts, encoding all cache misses in a single batch
+        
+        Returns:
+            List of embeddings in the same order as texts
+        """
+        cache_keys = [self._embedding_cache_key(text) for text in texts]
+        embeddings = [None] * len(texts)
+        missing = {}
         
-        if cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        with self._cache_lock:
+            for i, cache_key in enumerate(cache_keys):
+                cached = self.embedding_cache.get(cache_key)
+                if cached is not None:
+                    self.embedding_cache.move_to_end(cache_key)
+                    embeddings[i] = cached
+                else:
+                    missing.setdefault(cache_key, []).append(i)
+        
+        if not missing:
+            return embeddings
         
         self._load_model()
         
-        # Generate embedding
-        embedding = self.model.encode(text, convert_to_tensor=False)
+        # One forward pass for every uncached text instead of one per text
+        miss_keys = list(missing)
+        miss_texts = [texts[missing[key][0]] for key in miss_keys]
+        future = _inference_executor.submit(
+            self.model.encode, miss_texts, convert_to_tensor=False
+        )
+        try:
+            encoded = future.result(timeout=self.ENCODE_TIMEOUT)
+        except FutureTimeoutError:
+            # Drop the encode if it hasn't started, so requests that gave up don't
+            # keep the inference threads busy for the requests queued behind them
+            future.cancel()
+            raise TimeoutError(f"Embedding timed out after {self.ENCODE_TIMEOUT} seconds")
         
-        # Cache the embedding
-        self.embedding_cache[cache_key] = embedding
+        # Cache the embeddings, evicting the least recently used entries when full
+        with self._cache_lock:
+            for cache_key, embedding in zip(miss_keys, encoded):
+                for i in missing[cache_key]:
+                    embeddings[i] = embedding
+                self.embedding_cache[cache_key] = embedding
+            while len(self.embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                self.embedding_cache.popitem(last=False)
         
-        return embedding
+        return embeddings
     
     def compute_similarities(self, target_article: ArticleContent, articles: List[ArticleContent]) -> List[SimilarityScore]:
         """
@@ -62,23 +182,20 @@ class SimilarityEngine:
             return []
         
         try:
-            # Generate embedding for target article
-            target_text = f"{target_article.title} {target_article.content}"
-            target_embedding = self.generate_embedding(target_text)
+            # Embed target and comparison articles together in one batch
+            texts = [f"{target_article.title} {target_article.content}"]
+            texts.extend(f"{article.title} {article.content}" for article in articles)
+            target_embedding, *article_embeddings = self.generate_embeddings(texts)
+            
+            # Score every article against the target in one matrix-vector product
+            similarities = self._cosine_similarities(target_embedding, article_embeddings)
             
             similarity_scores = []
             
-            for article in articles:
+            for article, similarity in zip(articles, similarities):
                 try:
-                    # Generate embedding for comparison article
-                    article_text = f"{article.title} {article.content}"
-                    article_embedding = self.generate_embedding(article_text)
-                    
-                    # Compute cosine similarity
-                    similarity = self._cosine_similarity(target_embedding, article_embedding)
-                    
                     # Ensure similarity is between 0 and 1
-                    similarity = max(0.0, min(1.0, similarity))
+                    similarity = max(0.0, min(1.0, float(similarity)))
                     
                     # Check if source is trusted
                     is_trusted = self._is_trusted_source(article.source)
@@ -94,7 +211,7 @@ class SimilarityEngine:
                     similarity_scores.append(score)
                     
                 except Exception as e:
-                    print(f"Error computing similarity for {article.url}: {str(e)}")
+                    logger.warning("Error computing similarity for %s: %s", article.url, e)
                     continue
             
             # Sort by similarity score (highest first)
@@ -103,9 +220,20 @@ class SimilarityEngine:
             return similarity_scores
             
         except Exception as e:
-            print(f"Similarity computation failed: {str(e)}")
+            logger.error("Similarity computation failed: %s", e)
             return []
     
+    def _cosine_similarities(self, target: np.ndarray, embeddings: List[np.ndarray]) -> np.ndarray:
+        """Compute cosine similarity between target and each embedding (float32, vectorized)"""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        target = np.asarray(target, dtype=np.float32)
+        
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(target)
+        dots = matrix @ target
+        
+        # Zero-norm embeddings score 0.0, matching _cosine_similarity
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+    
     def _cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Compute cosine similarity between two embeddings"""
         # Normalize embeddings
@@ -122,18 +250,7 @@ class SimilarityEngine:
     
     def _is_trusted_source(self, source: str) -> bool:
         """Check if source is from a trusted news organization"""
-        trusted_sources = {
-            'bbc', 'reuters', 'associated press', 'cnn', 'npr',
-            'the guardian', 'new york times', 'washington post',
-            'wall street journal', 'bloomberg', 'the hindu', 'ndtv',
-            'times of india', 'indian express', 'hindustan times',
-            'the print', 'scroll', 'the quint', 'moneycontrol',
-            'india today', 'news18', 'firstpost', 'deccan herald',
-            'telegraph', 'tribune', 'mint', 'livemint', 'economic times'
-        }
-        
-        source_lower = source.lower()
-        return any(trusted in source_lower for trusted in trusted_sources)
+        return TRUSTED_SOURCE_PATTERN.search(source.lower()) is not None
         
     def search_knowledge_base(self, target_article: ArticleContent, top_k: int = 3) -> List[SimilarityScore]:
         """Search the Supabase Vector database for similar verified articles (RAG Retrieval)"""
@@ -144,17 +261,23 @@ class SimilarityEngine:
             target_text = f"{target_article.title} {target_article.content}"
             target_embedding = self.generate_embedding(target_text)
             
-            # Using pgvector's cosine distance operator (<=>)
-            similar_articles = db.session.query(KnowledgeArticle).order_by(
-                KnowledgeArticle.embedding.cosine_distance(target_embedding)
-            ).limit(top_k).all()
+            # Using pgvector's cosine distance operator (<=>), returned alongside each row.
+            # Only the columns the scores need: the article body and the stored
+            # vector (parsed into an array per row) are never fetched.
+            distance = KnowledgeArticle.embedding.cosine_distance(target_embedding)
+            similar_articles = db.session.query(
+                KnowledgeArticle.url, KnowledgeArticle.title, KnowledgeArticle.source,
+                distance.label('distance')
+            ).order_by(distance).limit(top_k).all()
             
             scores = []
             for article in similar_articles:
-                # Recompute exact similarity for the score
-                article_text = f"{article.title} {article.content}"
-                article_embedding = self.generate_embedding(article_text)
-                similarity = self._cosine_similarity(target_embedding, article_embedding)
+                article_distance = article.distance
+                if article_distance is None:
+                    continue
+                # Score from the embedding stored at index time rather than re-encoding
+                # the article on every search
+                similarity = 1.0 - float(article_distance)
                 
                 # Check if it meets a reasonable threshold (e.g. > 0.6)
                 if similarity > 0.6:
@@ -169,38 +292,64 @@ class SimilarityEngine:
             
             return scores
         except Exception as e:
-            print(f"RAG search failed: {str(e)}")
+            logger.error("RAG search failed: %s", e)
             return []
 
     def index_article(self, article: ArticleContent, verdict: str, is_trusted: bool):
         """Index a verified article into the Supabase Vector Database (RAG Ingestion)"""
+        self.index_articles([article], verdict, is_trusted)
+    
+    def index_articles(self, articles: List[ArticleContent], verdict: str, is_trusted: bool) -> int:
+        """
+        Bulk-index verified articles into the knowledge base (e.g. when seeding it)
+        
+        Returns:
+            Number of newly indexed articles
+        """
         from models.knowledge import KnowledgeArticle
         from models.user import db
         
         try:
-            # Check if it already exists
-            existing = KnowledgeArticle.query.filter_by(url=article.url).first()
-            if existing:
-                return
-                
-            article_text = f"{article.title} {article.content}"
-            embedding = self.generate_embedding(article_text)
+            # One lookup for all URLs instead of a query per article
+            urls = {article.url for article in articles}
+            existing = {
+                url for (url,) in db.session.query(KnowledgeArticle.url)
+                .filter(KnowledgeArticle.url.in_(urls))
+            }
+            
+            new_articles = []
+            for article in articles:
+                if article.url not in existing:
+                    existing.add(article.url)
+                    new_articles.append(article)
             
-            record = KnowledgeArticle(
-                url=article.url,
-                title=article.title,
-                content=article.content,
-                source=article.source,
-                verdict=verdict,
-                is_trusted=is_trusted,
-                embedding=embedding
+            if not new_articles:
+                return 0
+            
+            embeddings = self.generate_embeddings(
+                [f"{article.title} {article.content}" for article in new_articles]
             )
-            db.session.add(record)
+            
+            db.session.add_all([
+                KnowledgeArticle(
+                    url=article.url,
+                    title=article.title,
+                    content=article.content,
+                    source=article.source,
+                    verdict=verdict,
+                    is_trusted=is_trusted,
+                    embedding=embedding
+                )
+                for article, embedding in zip(new_articles, embeddings)
+            ])
             db.session.commit()
-            print(f"Indexed article into knowledge base: {article.title}")
+            for article in new_articles:
+                logger.debug("Indexed article into knowledge base: %s", article.title)
+            return len(new_articles)
         except Exception as e:
             db.session.rollback()
-            print(f"Failed to index article: {str(e)}")
+            logger.error("Failed to index article: %s", e)
+            return 0
 
     
     def clear_cache(self):
@@ -5,7 +5,6 @@ Enhanced with multi-model support and intelligent fallback
 
 from typing import List, Tuple, Optional, Dict
 from groq import Groq
-import os
 import time
 import logging
 
@@ -17,11 +16,14 @@ class ArticleSummarizer:
     """Service for summarizing articles and extracting key claims using multiple LLMs"""
     
     # Available models in priority order
-    MODELS = [
+    MODELS = (
         "llama-3.1-8b-instant",      # Primary: Fast and accurate
         "llama-3.3-70b-versatile",   # Secondary: Most powerful and reliable
         "llama-3.3-70b-versatile",   # Tertiary: Backup (same model for reliability)
-    ]
+    )
+    
+    # Seconds a successful availability check is reused (health checks poll every 30s)
+    SERVICE_CHECK_TTL = 60
     
     def __init__(self, api_key: str, timeout: int = 15, max_retries: int = 3):
         if not api_key:
@@ -39,6 +41,7 @@ class ArticleSummarizer:
         self.max_retries = max_retries
         self.current_model_index = 0
         self.preferred_model = None  # Allow setting a preferred model
+        self._service_checked_at = None  # monotonic time of last successful availability check
     
     def set_preferred_model(self, model: str):
         """Set a preferred model to use first"""
@@ -316,6 +319,11 @@ Article:
         Returns:
             True if service is available, False otherwise
         """
+        # Reuse a recent success instead of spending a completion on every probe
+        if (self._service_checked_at is not None and
+                time.monotonic() - self._service_checked_at < self.SERVICE_CHECK_TTL):
+            return True
+        
         for model in self.MODELS:
             try:
                 response = self.client.chat.completions.create(
@@ -325,6 +333,7 @@ Article:
                     timeout=5
                 )
                 logger.info(f"Service check passed with model: {model}")
+                self._service_checked_at = time.monotonic()
                 return True
             except Exception as e:
                 logger.warning(f"Service check failed for {model}: {str(e)}")
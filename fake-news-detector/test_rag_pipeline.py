@@ -17,6 +17,20 @@ from services.rag_pipeline import RAGPipeline
 from services.extractor import ArticleContent
 import json
 
+_pipeline = None
+
+
+def get_pipeline() -> RAGPipeline:
+    """Build the pipeline once and share it between the tests"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = RAGPipeline(
+            groq_api_key=os.getenv('GROQ_API_KEY'),
+            news_api_key=os.getenv('NEWS_API_KEY'),
+            serpapi_key=os.getenv('SERPAPI_KEY')
+        )
+    return _pipeline
+
 
 def test_rag_pipeline_url():
     """Test RAG pipeline with a URL"""
@@ -25,11 +39,7 @@ def test_rag_pipeline_url():
     print("=" * 80)
     
     # Initialize pipeline
-    pipeline = RAGPipeline(
-        groq_api_key=os.getenv('GROQ_API_KEY'),
-        news_api_key=os.getenv('NEWS_API_KEY'),
-        serpapi_key=os.getenv('SERPAPI_KEY')
-    )
+    pipeline = get_pipeline()
     
     # Test URL (replace with actual news URL)
     test_url = "https://www.bbc.com/news/world"
@@ -105,11 +115,7 @@ def test_rag_pipeline_text():
     print("=" * 80)
     
     # Initialize pipeline
-    pipeline = RAGPipeline(
-        groq_api_key=os.getenv('GROQ_API_KEY'),
-        news_api_key=os.getenv('NEWS_API_KEY'),
-        serpapi_key=os.getenv('SERPAPI_KEY')
-    )
+    pipeline = get_pipeline()
     
     # Test text (example claim)
     test_text = """